@@ -2,7 +2,6 @@
 import os
 import sys
 import json
-import time
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser, filedialog
@@ -13,29 +12,16 @@ import platform
 import re
 
 try:
-    from Quartz import (
-        CGEventCreate, CGEventGetLocation, CGEventCreateMouseEvent,
-        CGEventPost, CGEventSetIntegerValueField, CGEventSourceCreate,
-        kCGEventLeftMouseDown, kCGEventLeftMouseUp,
-        kCGEventRightMouseDown, kCGEventRightMouseUp,
-        kCGEventOtherMouseDown, kCGEventOtherMouseUp,
-        kCGMouseButtonLeft, kCGMouseButtonRight, kCGMouseButtonCenter,
-        kCGHIDEventTap, kCGEventSourceStateHIDSystemState
-    )
+    import Quartz
 except ImportError as e:
     print(f"Error importing macOS modules: {e}")
     print("Please install required dependencies:")
     print("pip3 install -r requirements.txt")
     sys.exit(1)
 
-try:
-    from pynput import keyboard
-    from pynput.keyboard import Key, KeyCode
-except ImportError as e:
-    print(f"Error importing pynput: {e}")
-    print("Please install pynput:")
-    print("pip3 install pynput==1.7.6")
-    sys.exit(1)
+from clicker_engine import AdvancedClickerEngine
+from click_process import ProcessClickerEngine
+from hotkey_manager import EnhancedHotkeyManager
 
 VERSION = "2.1.1"
 SETTINGS_FILE = os.path.expanduser("~/.aeroutclicker.json")
@@ -52,6 +38,39 @@ DEFAULT_SETTINGS = {
     "click_limit": 100,
     "theme": "default",
     "pause_on_movement": True,
+    "movement_threshold_px": 5.0,
+    "movement_velocity_threshold": 300.0,
+    "movement_hysteresis": 0.5,
+    "movement_resume_ms": 150.0,
+    "cursor_sample_hz": 250.0,
+    "fixed_point_enabled": False,
+    "fixed_point": [0, 0],
+    "schedule_mode": "deadline",
+    "late_policy": "catch_up",
+    "timing_mode": "sleep",
+    "spin_threshold_us": 2000.0,
+    "spin_cpu_budget": 0.5,
+    "humanize_enabled": False,
+    "humanize_distribution": "normal",
+    "humanize_spread": 0.1,
+    "humanize_min_factor": 0.5,
+    "humanize_max_factor": 1.5,
+    "humanize_seed": None,
+    "sequence_enabled": False,
+    "sequence_file": "",
+    "macro_playback_enabled": False,
+    "macro_file": "",
+    "high_priority": False,
+    "thread_priority": 10,
+    "cpu_affinity": [],
+    "engine_process": False,
+    "cps_controller_enabled": False,
+    "cps_controller_kp": 0.3,
+    "cps_controller_ki": 0.05,
+    "cps_controller_window": 50,
+    "cps_controller_max_fraction": 0.5,
+    "auto_calibrate": True,
+    "timing_calibration": None,
     "custom_colors": {
         "bg": "#f0f0f0",
         "fg": "#000000",
@@ -61,6 +80,9 @@ DEFAULT_SETTINGS = {
         "type": "keyboard",
         "keys": ["shift", "q"]
     },
+    "hotkey_bindings": [],
+    "hotkey_suppress": False,
+    "profiles": {},
     "last_update_check": None
 }
 
@@ -115,305 +137,6 @@ def export_config(file_path):
     except Exception as e:
         return False, f"Error exporting configuration: {e}"
 
-class EnhancedHotkeyManager:
-    def __init__(self, callback, settings):
-        self.callback = callback
-        self.settings = settings
-        self.current_keys = set()
-        self.listener = None
-        self.capturing = False
-        self.capture_callback = None
-        self.start_listener()
-        
-    def start_listener(self):
-        try:
-            if self.listener and self.listener.is_alive():
-                self.listener.stop()
-                
-            self.listener = keyboard.Listener(
-                on_press=self.on_press,
-                on_release=self.on_release,
-                suppress=False
-            )
-            self.listener.daemon = True
-            self.listener.start()
-        except Exception as e:
-            print(f"Error starting keyboard listener: {e}")
-        
-    def stop_listener(self):
-        if self.listener:
-            try:
-                self.listener.stop()
-                self.listener = None
-            except Exception as e:
-                print(f"Error stopping keyboard listener: {e}")
-        
-    def restart_listener(self):
-        self.stop_listener()
-        time.sleep(0.5)
-        self.start_listener()
-        
-    def on_press(self, key):
-        try:
-            key_str = self._key_to_string(key)
-            
-            if key_str:
-                if self.capturing:
-                    self.current_keys.add(key_str)
-                    return True
-                    
-                hotkey = self.settings["hotkey"]
-                if hotkey["type"] == "keyboard":
-                    hotkey_keys = set(hotkey.get("keys", []))
-                    self.current_keys.add(key_str)
-                    
-                    if hotkey_keys and hotkey_keys.issubset(self.current_keys):
-                        if self.settings["mode"] == "hold" and len(self.current_keys) == len(hotkey_keys):
-                            self.callback(True)
-                        elif self.settings["mode"] == "toggle":
-                            self.callback(None)
-        except Exception as e:
-            print(f"Error in on_press: {e}")
-        return True
-        
-    def on_release(self, key):
-        try:
-            key_str = self._key_to_string(key)
-            
-            if key_str:
-                if self.capturing and key_str in self.current_keys:
-                    if self.current_keys:
-                        new_hotkey = {
-                            "type": "keyboard",
-                            "keys": list(self.current_keys)
-                        }
-                        self.settings["hotkey"] = new_hotkey
-                        save_settings(self.settings)
-                        
-                        if self.capture_callback:
-                            self.capture_callback(new_hotkey)
-                        
-                        self.capturing = False
-                    self.current_keys = set()
-                    return True
-                    
-                if key_str in self.current_keys:
-                    self.current_keys.remove(key_str)
-                    
-                if self.settings["mode"] == "hold":
-                    hotkey_keys = set(self.settings["hotkey"].get("keys", []))
-                    if key_str in hotkey_keys and not hotkey_keys.issubset(self.current_keys):
-                        self.callback(False)
-        except Exception as e:
-            print(f"Error in on_release: {e}")
-        return True
-        
-    def _key_to_string(self, key):
-        try:
-            if isinstance(key, Key):
-                if key == Key.shift or key == Key.shift_r or key == Key.shift_l:
-                    return "shift"
-                elif key == Key.ctrl or key == Key.ctrl_r or key == Key.ctrl_l:
-                    return "ctrl"
-                elif key == Key.alt or key == Key.alt_r or key == Key.alt_l:
-                    return "alt"
-                elif key == Key.cmd or key == Key.cmd_r or key == Key.cmd_l:
-                    return "cmd"
-                elif key == Key.space:
-                    return "space"
-                elif key == Key.tab:
-                    return "tab"
-                elif key == Key.enter:
-                    return "enter"
-                elif key == Key.esc:
-                    return "esc"
-                else:
-                    return key.name
-            elif isinstance(key, KeyCode):
-                if key.char is not None:
-                    return key.char.lower()
-                elif key.vk is not None:
-                    if 48 <= key.vk <= 57:
-                        return chr(key.vk)
-                    elif 65 <= key.vk <= 90:
-                        return chr(key.vk + 32)
-                    elif key.vk >= 96 and key.vk <= 105:
-                        return str(key.vk - 96)
-            return None
-        except Exception as e:
-            print(f"Error converting key: {e}")
-            return None
-        
-    def start_capture(self, callback):
-        self.capturing = True
-        self.current_keys = set()
-        self.capture_callback = callback
-
-class AdvancedClickerEngine:
-    def __init__(self, settings, status_callback=None):
-        self.settings = settings
-        self.status_callback = status_callback
-        self.clicking = False
-        self.click_thread = None
-        self.stop_event = threading.Event()
-        self.click_count = 0
-        self.event_source = CGEventSourceCreate(kCGEventSourceStateHIDSystemState)
-        self.last_mouse_position = (0, 0)
-        self.movement_threshold = 5 
-        self.movement_detected = False
-        
-        self.button_map = {
-            "left": {
-                "down": kCGEventLeftMouseDown,
-                "up": kCGEventLeftMouseUp,
-                "button": kCGMouseButtonLeft
-            },
-            "right": {
-                "down": kCGEventRightMouseDown,
-                "up": kCGEventRightMouseUp,
-                "button": kCGMouseButtonRight
-            },
-            "middle": {
-                "down": kCGEventOtherMouseDown,
-                "up": kCGEventOtherMouseUp,
-                "button": kCGMouseButtonCenter
-            }
-        }
-
-    def get_mouse_position(self):
-        event = CGEventCreate(None)
-        position = CGEventGetLocation(event)
-        if (abs(position.x - self.last_mouse_position[0]) > self.movement_threshold or
-            abs(position.y - self.last_mouse_position[1]) > self.movement_threshold):
-            self.movement_detected = True
-        else:
-            self.movement_detected = False
-        self.last_mouse_position = position
-        return position
-
-    def perform_click(self, position, button_type="left"):
-        try:
-            button_info = self.button_map.get(button_type, self.button_map["left"])
-
-            mouse_down = CGEventCreateMouseEvent(
-                self.event_source,
-                button_info["down"],
-                position,
-                button_info["button"]
-            )
-
-            CGEventPost(kCGHIDEventTap, mouse_down)
-
-            hold_time = self.settings.get("hold_time", 0.0)
-            if hold_time > 0:
-                time.sleep(hold_time / 1000.0)
-            else:
-                interval_ms = max(1.0, self.settings["interval_ms"])
-                duty_cycle = max(1.0, min(99.0, self.settings["duty_cycle"]))
-                on_time = (interval_ms * duty_cycle) / 100.0 / 1000.0
-                time.sleep(on_time)
-
-            mouse_up = CGEventCreateMouseEvent(
-                self.event_source,
-                button_info["up"],
-                position,
-                button_info["button"]
-            )
-            CGEventPost(kCGHIDEventTap, mouse_up)
-            
-            return True
-        except Exception as e:
-            print(f"Error performing click: {e}")
-            return False
-        
-    def clicking_loop(self):
-        try:
-            self.click_count = 0
-            limit_enabled = self.settings["limit_enabled"]
-            click_limit = self.settings["click_limit"] if limit_enabled else 0
-            
-            if self.status_callback:
-                self.status_callback("Running")
-                
-            while not self.stop_event.is_set():
-                start_time = time.perf_counter()
-
-                if self.movement_detected and self.settings.get("pause_on_movement", True):
-                    time.sleep(0.01)
-                    continue
-                    
-                position = self.get_mouse_position()
-                success = self.perform_click(position, self.settings["mouse_button"])
-                
-                if success:
-                    self.click_count += 1
-                    if limit_enabled and self.click_count >= click_limit:
-                        break
-
-                interval_ms = max(1.0, self.settings["interval_ms"])
-                hold_time = self.settings.get("hold_time", 0.0)
-                
-                if hold_time > 0:
-                    elapsed = (time.perf_counter() - start_time) * 1000
-                    wait_time = max(0, (interval_ms - hold_time - elapsed) / 1000.0)
-                else:
-                    duty_cycle = max(1.0, min(99.0, self.settings["duty_cycle"]))
-                    on_time = (interval_ms * duty_cycle) / 100.0 / 1000.0
-                    elapsed = (time.perf_counter() - start_time) * 1000
-                    wait_time = max(0, (interval_ms - elapsed) / 1000.0)
-                    
-                if wait_time > 0 and not self.stop_event.is_set():
-                    time.sleep(wait_time)
-            
-            if self.status_callback:
-                if limit_enabled and self.click_count >= click_limit:
-                    self.status_callback(f"Completed {self.click_count} clicks")
-                else:
-                    self.status_callback("Stopped")
-                    
-            self.clicking = False
-        except Exception as e:
-            print(f"Error in clicking loop: {e}")
-            if self.status_callback:
-                self.status_callback(f"Error: {str(e)}")
-            self.clicking = False
-        
-    def start_clicking(self):
-        if not self.clicking:
-            self.clicking = True
-            self.stop_event.clear()
-            self.click_thread = threading.Thread(target=self.clicking_loop)
-            self.click_thread.daemon = True
-            self.click_thread.start()
-            return True
-        return False
-        
-    def stop_clicking(self):
-        if self.clicking:
-            self.stop_event.set()
-            if self.click_thread and self.click_thread.is_alive():
-                try:
-                    self.click_thread.join(timeout=1.0)
-                except Exception as e:
-                    print(f"Error joining click thread: {e}")
-            self.clicking = False
-            return True
-        return False
-        
-    def toggle_clicking(self):
-        if self.clicking:
-            return self.stop_clicking()
-        else:
-            return self.start_clicking()
-        
-    def handle_hotkey(self, state=None):
-        if state is None:
-            return self.toggle_clicking()
-        elif state:
-            return self.start_clicking()
-        else:
-            return self.stop_clicking()
-
 class FloatEntry(ttk.Entry):
     def __init__(self, master=None, decimal_places=2, min_value=0.0, max_value=float('inf'), **kwargs):
         self.decimal_places = decimal_places
@@ -543,11 +266,20 @@ class AeroutSpeedAutoClickerGUI:
         self.settings = load_settings()
         self.root = tk.Tk()
 
-        self.clicker_engine = AdvancedClickerEngine(self.settings)
+        if self.settings.get("engine_process", False):
+            self.clicker_engine = ProcessClickerEngine(self.settings, save_callback=save_settings)
+        else:
+            self.clicker_engine = AdvancedClickerEngine(self.settings, save_callback=save_settings)
 
         self.clicker_engine.status_callback = self.update_status
+        self.hotkey_paused = False
         
-        self.hotkey_manager = EnhancedHotkeyManager(self.clicker_engine.handle_hotkey, self.settings)
+        self.hotkey_manager = EnhancedHotkeyManager(
+            self.clicker_engine.handle_hotkey,
+            self.settings,
+            save_callback=save_settings,
+            actions=self.hotkey_actions()
+        )
         
         self.root.title(f"Aerout SpeedAutoClicker v{VERSION}")
         self.root.geometry("500x650")
@@ -697,7 +429,7 @@ class AeroutSpeedAutoClickerGUI:
             textvariable=self.interval_var, 
             width=10,
             decimal_places=2,
-            min_value=1.0,
+            min_value=0.01,
             max_value=10000.0
         )
         self.interval_entry.pack(side="left", padx=(5, 5))
@@ -743,6 +475,13 @@ class AeroutSpeedAutoClickerGUI:
             command=self.start_hotkey_capture
         )
         self.hotkey_button.pack(side="right")
+
+        self.bindings_label = ttk.Label(
+            self.main_tab,
+            text=self.format_bindings_display(),
+            font=("Arial", 9)
+        )
+        self.bindings_label.pack(anchor="w")
         
         self.create_section_label(self.main_tab, "Hotkey Activation Mode")
         
@@ -768,6 +507,15 @@ class AeroutSpeedAutoClickerGUI:
             command=self.update_mode
         )
         hold_rb.pack(anchor="w")
+
+        self.hotkey_suppress_var = tk.BooleanVar(value=self.settings.get("hotkey_suppress", False))
+        suppress_check = ttk.Checkbutton(
+            mode_frame,
+            text="Hide hotkey from other apps",
+            variable=self.hotkey_suppress_var,
+            command=self.update_hotkey_suppress
+        )
+        suppress_check.pack(anchor="w", pady=(5, 0))
         
         control_frame = ttk.Frame(self.main_tab)
         control_frame.pack(fill="x", pady=15)
@@ -840,6 +588,60 @@ class AeroutSpeedAutoClickerGUI:
         
         ttk.Label(hold_frame, text="(0 = use duty cycle instead)").pack(side="left", padx=(10, 0))
 
+        schedule_frame = ttk.Frame(self.advanced_tab)
+        schedule_frame.pack(fill="x", pady=5)
+
+        self.deadline_var = tk.BooleanVar(value=self.settings.get("schedule_mode", "deadline") == "deadline")
+        deadline_check = ttk.Checkbutton(
+            schedule_frame,
+            text="Drift-free timing (schedule clicks from start time)",
+            variable=self.deadline_var,
+            command=self.update_schedule_mode
+        )
+        deadline_check.pack(anchor="w")
+
+        self.precise_var = tk.BooleanVar(value=self.settings.get("timing_mode", "sleep") == "precise")
+        precise_check = ttk.Checkbutton(
+            schedule_frame,
+            text="High precision timing (allows intervals below 1 ms, uses more CPU)",
+            variable=self.precise_var,
+            command=self.update_timing_mode
+        )
+        precise_check.pack(anchor="w")
+
+        humanize_frame = ttk.Frame(self.advanced_tab)
+        humanize_frame.pack(fill="x", pady=5)
+
+        self.humanize_var = tk.BooleanVar(value=self.settings.get("humanize_enabled", False))
+        humanize_check = ttk.Checkbutton(
+            humanize_frame,
+            text="Humanize timing, spread:",
+            variable=self.humanize_var,
+            command=self.update_humanize
+        )
+        humanize_check.pack(side="left")
+
+        self.humanize_spread_var = tk.StringVar(value=f"{self.settings.get('humanize_spread', 0.1) * 100:.2f}")
+        FloatEntry(
+            humanize_frame,
+            textvariable=self.humanize_spread_var,
+            width=8,
+            decimal_places=2,
+            min_value=0.0,
+            max_value=50.0
+        ).pack(side="left", padx=(5, 5))
+
+        ttk.Label(humanize_frame, text="%").pack(side="left")
+
+        self.cps_controller_var = tk.BooleanVar(value=self.settings.get("cps_controller_enabled", False))
+        cps_controller_check = ttk.Checkbutton(
+            self.advanced_tab,
+            text="Closed-loop CPS control (when drift-free timing is off)",
+            variable=self.cps_controller_var,
+            command=self.update_cps_controller
+        )
+        cps_controller_check.pack(anchor="w", pady=5)
+
         self.create_section_label(self.advanced_tab, "Click Limit")
         
         limit_frame = ttk.Frame(self.advanced_tab)
@@ -886,9 +688,145 @@ class AeroutSpeedAutoClickerGUI:
             font=("Arial", 8)
         ).pack(anchor="w", pady=(0, 5))
 
+        resume_frame = ttk.Frame(self.advanced_tab)
+        resume_frame.pack(fill="x", pady=5)
+
+        ttk.Label(resume_frame, text="Resume after:").pack(side="left")
+
+        self.resume_var = tk.StringVar(value=f"{self.settings.get('movement_resume_ms', 150.0):.2f}")
+        FloatEntry(
+            resume_frame,
+            textvariable=self.resume_var,
+            width=10,
+            decimal_places=2,
+            min_value=0.0,
+            max_value=10000.0
+        ).pack(side="left", padx=(5, 5))
+
+        ttk.Label(resume_frame, text="ms without movement").pack(side="left")
+
+        fixed_frame = ttk.Frame(self.advanced_tab)
+        fixed_frame.pack(fill="x", pady=5)
+
+        self.fixed_point_var = tk.BooleanVar(value=self.settings.get("fixed_point_enabled", False))
+        fixed_point_check = ttk.Checkbutton(
+            fixed_frame,
+            text="Click at fixed point",
+            variable=self.fixed_point_var,
+            command=self.update_fixed_point
+        )
+        fixed_point_check.pack(side="left")
+
+        fixed_point = self.settings.get("fixed_point", [0, 0])
+        self.fixed_x_var = tk.StringVar(value=str(int(fixed_point[0])))
+        self.fixed_y_var = tk.StringVar(value=str(int(fixed_point[1])))
+
+        ttk.Label(fixed_frame, text="X:").pack(side="left", padx=(10, 0))
+        IntEntry(fixed_frame, textvariable=self.fixed_x_var, width=6, min_value=0, max_value=100000).pack(side="left", padx=(5, 5))
+        ttk.Label(fixed_frame, text="Y:").pack(side="left")
+        IntEntry(fixed_frame, textvariable=self.fixed_y_var, width=6, min_value=0, max_value=100000).pack(side="left", padx=(5, 5))
+
+        self.capture_point_button = ttk.Button(
+            fixed_frame,
+            text="Capture (3s)",
+            command=self.start_fixed_point_capture
+        )
+        self.capture_point_button.pack(side="right")
+
+        self.create_section_label(self.advanced_tab, "Timer Calibration")
+
+        calibration_frame = ttk.Frame(self.advanced_tab)
+        calibration_frame.pack(fill="x", pady=5)
+
+        self.calibration_label = ttk.Label(
+            calibration_frame,
+            text=self.format_calibration_display(),
+            font=("Arial", 9)
+        )
+        self.calibration_label.pack(side="left")
+
+        recalibrate_button = ttk.Button(
+            calibration_frame,
+            text="Recalibrate",
+            command=self.recalibrate_timer
+        )
+        recalibrate_button.pack(side="right")
+
+        self.create_section_label(self.advanced_tab, "Click Timing")
+
+        timing_frame = ttk.Frame(self.advanced_tab)
+        timing_frame.pack(fill="x", pady=5)
+
+        self.timing_label = ttk.Label(
+            timing_frame,
+            text=self.format_timing_display(),
+            font=("Arial", 9)
+        )
+        self.timing_label.pack(side="left")
+
+        report_button = ttk.Button(
+            timing_frame,
+            text="Diagnostic Report",
+            command=self.create_diagnostic_report
+        )
+        report_button.pack(side="right")
+
+        refresh_timing_button = ttk.Button(
+            timing_frame,
+            text="Refresh",
+            command=self.refresh_timing_display
+        )
+        refresh_timing_button.pack(side="right", padx=5)
+
+        self.hotkey_metrics_label = ttk.Label(
+            self.advanced_tab,
+            text=self.format_hotkey_metrics(),
+            font=("Arial", 9)
+        )
+        self.hotkey_metrics_label.pack(anchor="w")
+
+        self.create_section_label(self.advanced_tab, "Thread Priority")
+
+        priority_frame = ttk.Frame(self.advanced_tab)
+        priority_frame.pack(fill="x", pady=5)
+
+        self.high_priority_var = tk.BooleanVar(value=self.settings.get("high_priority", False))
+        high_priority_check = ttk.Checkbutton(
+            priority_frame,
+            text="High priority click thread",
+            variable=self.high_priority_var,
+            command=self.update_high_priority
+        )
+        high_priority_check.pack(side="left")
+
+        self.cpu_affinity_var = tk.StringVar(value=self.format_cpu_affinity())
+        ttk.Entry(priority_frame, textvariable=self.cpu_affinity_var, width=10).pack(side="right")
+        ttk.Label(priority_frame, text="Cores:").pack(side="right", padx=(5, 5))
+
+        self.priority_label = ttk.Label(
+            self.advanced_tab,
+            text=self.format_priority_display(),
+            font=("Arial", 9)
+        )
+        self.priority_label.pack(anchor="w")
+
+        self.engine_process_var = tk.BooleanVar(value=self.settings.get("engine_process", False))
+        engine_process_check = ttk.Checkbutton(
+            self.advanced_tab,
+            text="Run click engine in a separate process (restart required)",
+            variable=self.engine_process_var,
+            command=self.update_engine_process
+        )
+        engine_process_check.pack(anchor="w", pady=5)
+
         self.duty_var.trace_add('write', self.update_duty_cycle)
         self.hold_var.trace_add('write', self.update_hold_time)
         self.limit_count_var.trace_add('write', self.update_click_limit)
+        self.humanize_spread_var.trace_add('write', self.update_humanize)
+        self.resume_var.trace_add('write', self.update_resume_delay)
+        self.fixed_x_var.trace_add('write', self.update_fixed_point)
+        self.fixed_y_var.trace_add('write', self.update_fixed_point)
+        self.cpu_affinity_var.trace_add('write', self.update_cpu_affinity)
 
     def build_settings_tab(self):
         self.create_section_label(self.settings_tab, "Theme Settings")
@@ -1051,6 +989,69 @@ class AeroutSpeedAutoClickerGUI:
             command=self.reset_settings
         )
         reset_button.pack(side="left")
+
+        self.create_section_label(self.settings_tab, "Click Sequence")
+
+        sequence_frame = ttk.Frame(self.settings_tab)
+        sequence_frame.pack(fill="x", pady=5)
+
+        self.sequence_var = tk.BooleanVar(value=self.settings.get("sequence_enabled", False))
+        sequence_check = ttk.Checkbutton(
+            sequence_frame,
+            text="Play sequence instead of fixed interval",
+            variable=self.sequence_var,
+            command=self.update_sequence_enabled
+        )
+        sequence_check.pack(side="left")
+
+        load_sequence_button = ttk.Button(
+            sequence_frame,
+            text="Load Sequence",
+            command=self.load_sequence_file
+        )
+        load_sequence_button.pack(side="right")
+
+        self.sequence_label = ttk.Label(
+            self.settings_tab,
+            text=self.format_sequence_display(),
+            font=("Arial", 9)
+        )
+        self.sequence_label.pack(anchor="w")
+
+        self.create_section_label(self.settings_tab, "Macro")
+
+        macro_frame = ttk.Frame(self.settings_tab)
+        macro_frame.pack(fill="x", pady=5)
+
+        self.macro_var = tk.BooleanVar(value=self.settings.get("macro_playback_enabled", False))
+        macro_check = ttk.Checkbutton(
+            macro_frame,
+            text="Play macro instead of clicking",
+            variable=self.macro_var,
+            command=self.update_macro_enabled
+        )
+        macro_check.pack(side="left")
+
+        load_macro_button = ttk.Button(
+            macro_frame,
+            text="Load Macro",
+            command=self.load_macro_file
+        )
+        load_macro_button.pack(side="right")
+
+        self.record_button = ttk.Button(
+            macro_frame,
+            text="Record",
+            command=self.toggle_recording
+        )
+        self.record_button.pack(side="right", padx=5)
+
+        self.macro_label = ttk.Label(
+            self.settings_tab,
+            text=self.format_macro_display(),
+            font=("Arial", 9)
+        )
+        self.macro_label.pack(anchor="w")
         
     def build_about_tab(self):
         about_frame = ttk.Frame(self.about_tab)
@@ -1141,24 +1142,249 @@ class AeroutSpeedAutoClickerGUI:
     def update_mouse_button(self):
         self.settings["mouse_button"] = self.mouse_button_var.get()
         save_settings(self.settings)
+        self.clicker_engine.update_settings()
         
     def update_mode(self):
         self.settings["mode"] = self.mode_var.get()
         save_settings(self.settings)
+        self.hotkey_manager.update_settings()
         
+    def update_hotkey_suppress(self):
+        self.settings["hotkey_suppress"] = self.hotkey_suppress_var.get()
+        save_settings(self.settings)
+        self.hotkey_manager.update_settings()
+
     def update_duty_cycle(self, *args):
         try:
             duty = float(self.duty_var.get())
             if 1.0 <= duty <= 99.0:
                 self.settings["duty_cycle"] = duty
                 save_settings(self.settings)
+                self.clicker_engine.update_settings()
+        except ValueError:
+            pass
+
+    def update_schedule_mode(self):
+        self.settings["schedule_mode"] = "deadline" if self.deadline_var.get() else "relative"
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+
+    def update_timing_mode(self):
+        self.settings["timing_mode"] = "precise" if self.precise_var.get() else "sleep"
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+
+    def format_calibration_display(self):
+        calibration = self.clicker_engine.get_calibration()
+        if not calibration:
+            return "Sleep overshoot: not calibrated"
+        return (f"Sleep overshoot: median {calibration['median_us']:.0f} us, "
+                f"p99 {calibration['p99_us']:.0f} us")
+
+    def recalibrate_timer(self):
+        if self.clicker_engine.clicking:
+            messagebox.showinfo("Recalibrate", "Stop clicking before recalibrating the timer.")
+            return
+        self.clicker_engine.calibrate()
+        self.calibration_label.config(text=self.format_calibration_display())
+
+    def format_timing_display(self):
+        stats = self.clicker_engine.get_timing_stats()
+        if not stats["clicks"]:
+            return "No clicks measured yet"
+        return (f"{stats['achieved_cps']:.1f} CPS, lateness p50 {stats['lateness_p50_us']:.0f} us, "
+                f"p99 {stats['lateness_p99_us']:.0f} us, max {stats['lateness_max_us']:.0f} us, "
+                f"first click {stats['start_latency_us']:.0f} us{self.format_controller_display()}")
+
+    def format_controller_display(self):
+        state = self.clicker_engine.get_controller_state()
+        if not state:
+            return ""
+        return f", controller error {state['error_cps']:+.1f} CPS, correction {state['correction_us']:+.0f} us"
+
+    def update_cps_controller(self):
+        self.settings["cps_controller_enabled"] = self.cps_controller_var.get()
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+
+    def format_hotkey_metrics(self):
+        metrics = self.hotkey_manager.get_metrics()
+        return (f"Hotkey callback p99 {metrics['callback_p99_us']:.1f} us, "
+                f"action latency p99 {metrics['dispatch_p99_us']:.0f} us, "
+                f"{metrics['repeats_dropped']} repeats ignored")
+
+    def refresh_timing_display(self):
+        self.timing_label.config(text=self.format_timing_display())
+        self.hotkey_metrics_label.config(text=self.format_hotkey_metrics())
+        self.refresh_priority_display()
+
+    def create_diagnostic_report(self):
+        from logger import app_logger
+
+        self.refresh_timing_display()
+        report = app_logger.create_diagnostic_report(self.clicker_engine.get_timing_stats())
+        if report:
+            messagebox.showinfo("Diagnostic Report", f"Report saved to:\n{report}")
+        else:
+            messagebox.showerror("Diagnostic Report", "Could not create the diagnostic report.")
+
+    def update_fixed_point(self, *args):
+        try:
+            self.settings["fixed_point"] = [int(self.fixed_x_var.get()), int(self.fixed_y_var.get())]
         except ValueError:
             pass
+        self.settings["fixed_point_enabled"] = self.fixed_point_var.get()
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+
+    def start_fixed_point_capture(self):
+        self.capture_point_button.config(text="Move mouse...")
+        self.root.after(3000, self.finish_fixed_point_capture)
+
+    def finish_fixed_point_capture(self):
+        try:
+            position = self.clicker_engine.backend.get_mouse_position()
+            self.fixed_x_var.set(str(int(position.x)))
+            self.fixed_y_var.set(str(int(position.y)))
+        except Exception as e:
+            print(f"Error capturing cursor position: {e}")
+        self.capture_point_button.config(text="Capture (3s)")
+
+    def format_cpu_affinity(self):
+        return ",".join(str(cpu) for cpu in self.settings.get("cpu_affinity", []))
+
+    def format_priority_display(self):
+        if not self.settings.get("high_priority", False):
+            return "Click thread priority: normal"
+        status = self.clicker_engine.priority_status
+        if status is None:
+            return "Click thread priority: applied on next start"
+        cpus = ",".join(str(cpu) for cpu in status["cpus"]) if status["cpus"] else "any"
+        return f"Click thread priority: {status['policy']}, cores {cpus}"
+
+    def refresh_priority_display(self):
+        self.priority_label.config(text=self.format_priority_display())
+
+    def update_high_priority(self):
+        self.settings["high_priority"] = self.high_priority_var.get()
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+        self.refresh_priority_display()
+
+    def update_engine_process(self):
+        self.settings["engine_process"] = self.engine_process_var.get()
+        save_settings(self.settings)
+
+    def update_cpu_affinity(self, *args):
+        try:
+            text = self.cpu_affinity_var.get().replace(" ", "")
+            cpus = [int(part) for part in text.split(",") if part]
+            if all(cpu >= 0 for cpu in cpus):
+                self.settings["cpu_affinity"] = cpus
+                save_settings(self.settings)
+                self.clicker_engine.update_settings()
+        except ValueError:
+            pass
+
+    def update_resume_delay(self, *args):
+        try:
+            resume_ms = float(self.resume_var.get())
+            if resume_ms >= 0:
+                self.settings["movement_resume_ms"] = resume_ms
+                save_settings(self.settings)
+                self.clicker_engine.update_settings()
+        except ValueError:
+            pass
+
+    def update_humanize(self, *args):
+        try:
+            spread = float(self.humanize_spread_var.get())
+            if 0.0 <= spread <= 50.0:
+                self.settings["humanize_spread"] = spread / 100.0
+        except ValueError:
+            pass
+        self.settings["humanize_enabled"] = self.humanize_var.get()
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+
+    def format_sequence_display(self):
+        sequence_file = self.settings.get("sequence_file", "")
+        if not sequence_file:
+            return "No sequence loaded"
+        click_count = self.clicker_engine.get_sequence_clicks()
+        if click_count is None:
+            return f"{os.path.basename(sequence_file)} (not loaded)"
+        return f"{os.path.basename(sequence_file)}: {click_count} clicks"
+
+    def update_sequence_enabled(self):
+        self.settings["sequence_enabled"] = self.sequence_var.get()
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+        self.sequence_label.config(text=self.format_sequence_display())
+
+    def load_sequence_file(self):
+        file_path = filedialog.askopenfilename(
+            title="Load Click Sequence",
+            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")]
+        )
+
+        if file_path:
+            self.settings["sequence_file"] = file_path
+            self.settings["sequence_enabled"] = True
+            self.sequence_var.set(True)
+            save_settings(self.settings)
+            self.clicker_engine.update_settings()
+            self.sequence_label.config(text=self.format_sequence_display())
+
+    def format_macro_display(self):
+        macro_file = self.settings.get("macro_file", "")
+        if not macro_file:
+            return "No macro loaded"
+        return os.path.basename(macro_file)
+
+    def update_macro_enabled(self):
+        self.settings["macro_playback_enabled"] = self.macro_var.get()
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+
+    def load_macro_file(self):
+        file_path = filedialog.askopenfilename(
+            title="Load Macro",
+            filetypes=[("Macro Files", "*.aerm"), ("All Files", "*.*")]
+        )
+
+        if file_path:
+            self.settings["macro_file"] = file_path
+            self.settings["macro_playback_enabled"] = True
+            self.macro_var.set(True)
+            save_settings(self.settings)
+            self.clicker_engine.update_settings()
+            self.macro_label.config(text=self.format_macro_display())
+
+    def toggle_recording(self):
+        if self.clicker_engine.macro_recorder is not None:
+            count = self.clicker_engine.stop_recording()
+            self.record_button.config(text="Record")
+            self.macro_label.config(text=f"{self.format_macro_display()}: {count} events recorded")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            title="Record Macro",
+            defaultextension=".aerm",
+            filetypes=[("Macro Files", "*.aerm"), ("All Files", "*.*")]
+        )
+
+        if file_path and self.clicker_engine.start_recording(file_path):
+            self.settings["macro_file"] = file_path
+            save_settings(self.settings)
+            self.clicker_engine.update_settings()
+            self.record_button.config(text="Stop")
+            self.macro_label.config(text=f"Recording to {os.path.basename(file_path)}...")
 
     def update_pause_movement(self):
         self.settings["pause_on_movement"] = self.pause_movement_var.get()
         save_settings(self.settings)
-        self.clicker_engine.settings = self.settings  
+        self.clicker_engine.update_settings()
             
     def update_hold_time(self, *args):
         try:
@@ -1166,12 +1392,14 @@ class AeroutSpeedAutoClickerGUI:
             if hold_time >= 0:
                 self.settings["hold_time"] = hold_time
                 save_settings(self.settings)
+                self.clicker_engine.update_settings()
         except ValueError:
             pass
             
     def update_limit_enabled(self):
         self.settings["limit_enabled"] = self.limit_var.get()
         save_settings(self.settings)
+        self.clicker_engine.update_settings()
         
     def update_click_limit(self, *args):
         try:
@@ -1179,6 +1407,7 @@ class AeroutSpeedAutoClickerGUI:
             if limit > 0:
                 self.settings["click_limit"] = limit
                 save_settings(self.settings)
+                self.clicker_engine.update_settings()
         except ValueError:
             pass
             
@@ -1204,20 +1433,115 @@ class AeroutSpeedAutoClickerGUI:
                 
     def format_hotkey_display(self):
         hotkey = self.settings.get("hotkey", {"type": "keyboard", "keys": ["shift", "q"]})
-        if hotkey["type"] == "keyboard":
+        if hotkey["type"] in ("keyboard", "mouse"):
             keys = hotkey.get("keys", [])
             if keys:
-                return "Current Hotkey: " + " + ".join(key.upper() for key in keys)
+                return "Current Hotkey: " + " + ".join(key.replace("_", " ").upper() for key in keys)
         return "No hotkey set"
         
     def start_hotkey_capture(self):
         self.hotkey_button.config(text="Press Keys...")
-        self.hotkey_display.config(text="Press the keys you want to use...")
+        self.hotkey_display.config(text="Press the keys or mouse buttons you want to use...")
         self.hotkey_manager.start_capture(self.finish_hotkey_capture)
         
     def finish_hotkey_capture(self, new_hotkey):
         self.hotkey_button.config(text="Set Hotkey")
         self.hotkey_display.config(text=self.format_hotkey_display())
+        self.bindings_label.config(text=self.format_bindings_display())
+
+    def format_bindings_display(self):
+        bindings = len(self.settings.get("hotkey_bindings", []))
+        conflicts = self.hotkey_manager.conflicts
+        text = f"Extra bindings: {bindings}"
+        if conflicts:
+            text += " (ignored: " + ", ".join(" + ".join(c["keys"]) for c in conflicts) + ")"
+        return text
+
+    def hotkey_actions(self):
+        """Return the actions that entries of the hotkey_bindings setting can use"""
+        return {
+            "toggle": self.hotkey_toggle,
+            "start": self.hotkey_start,
+            "stop": self.hotkey_stop,
+            "stop_all": self.hotkey_stop_all,
+            "pause": self.hotkey_pause,
+            "cps_up": self.hotkey_cps_up,
+            "cps_down": self.hotkey_cps_down,
+            "profile": self.hotkey_profile
+        }
+
+    def hotkey_toggle(self, state, binding):
+        self.clicker_engine.handle_hotkey(state)
+
+    def hotkey_start(self, state, binding):
+        if state is not False:
+            self.clicker_engine.start_clicking()
+
+    def hotkey_stop(self, state, binding):
+        if state is not False:
+            self.clicker_engine.stop_clicking()
+
+    def hotkey_stop_all(self, state, binding):
+        if state is not False:
+            self.root.after(0, self.stop_all)
+
+    def hotkey_pause(self, state, binding):
+        """Pause while a hold binding is down, or flip the pause on each press"""
+        if state is None:
+            state = not self.hotkey_paused
+        if state:
+            if self.clicker_engine.clicking:
+                self.hotkey_paused = True
+                self.clicker_engine.stop_clicking()
+        elif self.hotkey_paused:
+            self.hotkey_paused = False
+            self.clicker_engine.start_clicking()
+
+    def hotkey_cps_up(self, state, binding):
+        if state is not False:
+            self.adjust_cps(float(binding.options.get("step", 1.0)))
+
+    def hotkey_cps_down(self, state, binding):
+        if state is not False:
+            self.adjust_cps(-float(binding.options.get("step", 1.0)))
+
+    def hotkey_profile(self, state, binding):
+        if state is not False:
+            name = binding.options.get("profile")
+            self.root.after(0, lambda: self.apply_profile(name, binding.options.get("start", False)))
+
+    def adjust_cps(self, step):
+        """Change the click rate by step CPS and apply it to the running engine"""
+        cps = max(0.1, 1000.0 / self.settings["interval_ms"] + step)
+        self.settings["interval_ms"] = max(0.01, round(1000.0 / cps, 2))
+        save_settings(self.settings)
+        self.clicker_engine.update_settings()
+        self.root.after(0, lambda: self.interval_var.set(f"{self.settings['interval_ms']:.2f}"))
+
+    def apply_profile(self, name, start=False):
+        """Copy the settings stored under a profile name over the current ones"""
+        profile = self.settings.get("profiles", {}).get(name)
+        if profile is None:
+            print(f"Error applying profile: {name} not found")
+            return
+        for key, value in profile.items():
+            if key not in ("profiles", "hotkey_bindings"):
+                self.settings[key] = value
+        save_settings(self.settings)
+        self.reload_settings_to_ui()
+        self.update_status(f"Profile: {name}")
+        if start:
+            self.clicker_engine.start_clicking()
+
+    def stop_all(self):
+        """Stop clicking and macro recording"""
+        self.hotkey_paused = False
+        if self.clicker_engine.clicking:
+            self.clicker_engine.stop_clicking()
+            self.toggle_button.config(text="Start")
+            self.update_status("Stopped")
+        if self.clicker_engine.macro_recorder is not None:
+            self.toggle_recording()
         
     def toggle_clicking(self):
         if self.clicker_engine.clicking:
@@ -1234,6 +1558,7 @@ class AeroutSpeedAutoClickerGUI:
             self.clicker_engine.start_clicking()
             self.toggle_button.config(text="Stop")
             self.update_status("Running")
+            self.root.after(200, self.refresh_priority_display)
             
     def update_click_count_display(self):
         if hasattr(self.clicker_engine, 'click_count'):
@@ -1286,17 +1611,37 @@ class AeroutSpeedAutoClickerGUI:
         self.interval_var.set(f"{self.settings['interval_ms']:.2f}")
         self.mouse_button_var.set(self.settings["mouse_button"])
         self.mode_var.set(self.settings["mode"])
+        self.hotkey_suppress_var.set(self.settings.get("hotkey_suppress", False))
         self.hotkey_display.config(text=self.format_hotkey_display())
 
         self.duty_var.set(f"{self.settings['duty_cycle']:.2f}")
         self.hold_var.set(f"{self.settings.get('hold_time', 0.0):.2f}")
+        self.deadline_var.set(self.settings.get("schedule_mode", "deadline") == "deadline")
+        self.precise_var.set(self.settings.get("timing_mode", "sleep") == "precise")
         self.limit_var.set(self.settings["limit_enabled"])
+        self.sequence_var.set(self.settings.get("sequence_enabled", False))
+        self.sequence_label.config(text=self.format_sequence_display())
+        self.macro_var.set(self.settings.get("macro_playback_enabled", False))
+        self.high_priority_var.set(self.settings.get("high_priority", False))
+        self.cpu_affinity_var.set(self.format_cpu_affinity())
+        self.engine_process_var.set(self.settings.get("engine_process", False))
+        self.cps_controller_var.set(self.settings.get("cps_controller_enabled", False))
+        self.refresh_priority_display()
+        self.macro_label.config(text=self.format_macro_display())
+        self.humanize_var.set(self.settings.get("humanize_enabled", False))
+        self.humanize_spread_var.set(f"{self.settings.get('humanize_spread', 0.1) * 100:.2f}")
+        self.resume_var.set(f"{self.settings.get('movement_resume_ms', 150.0):.2f}")
+        self.fixed_point_var.set(self.settings.get("fixed_point_enabled", False))
+        fixed_point = self.settings.get("fixed_point", [0, 0])
+        self.fixed_x_var.set(str(int(fixed_point[0])))
+        self.fixed_y_var.set(str(int(fixed_point[1])))
         self.limit_count_var.set(str(self.settings["click_limit"]))
 
         self.theme_var.set(self.settings["theme"])
 
-        self.clicker_engine.settings = self.settings
-        self.hotkey_manager.settings = self.settings
+        self.clicker_engine.update_settings(self.settings)
+        self.hotkey_manager.update_settings(self.settings)
+        self.bindings_label.config(text=self.format_bindings_display())
         
     def check_for_updates(self):
         self.update_status_label.config(text="Checking for updates...")
@@ -1386,8 +1731,11 @@ class AeroutSpeedAutoClickerGUI:
         if self.clicker_engine.clicking:
             self.clicker_engine.stop_clicking()
 
+        self.clicker_engine.stop_recording()
+        self.clicker_engine.shutdown()
+
         if self.hotkey_manager:
-            self.hotkey_manager.stop_listener()
+            self.hotkey_manager.shutdown()
             
         self.root.destroy()
         
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for Aerout SpeedAutoClicker
+Measures the click engine against the in-memory recording backend
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+
+from click_backends import MouseEventCache, RecordingEventBackend
+from click_scheduler import ClickChannel, ClickScheduler
+from clicker_engine import MIN_INTERVAL_MS, AdvancedClickerEngine
+
+ENGINE_INTERVALS_MS = (0.1, 1.0, 10.0, 100.0)
+ENGINE_DUTY_CYCLES = (25.0, 75.0)
+ENGINE_HOLD_TIMES_MS = (0.05, 5.0)
+STOP_INTERVALS_MS = (1.0, 100.0, 1000.0, 10000.0)
+
+HIGHER_IS_BETTER = ("cps", "rate_ratio", "released_ratio")
+LOWER_IS_BETTER = ("_us", "ns_per_click", "ns_per_event", "events_created_per_click")
+
+
+def bench_event_cache(clicks=100000):
+    """Compare per-click event creation against the reusable event cache"""
+    results = {}
+
+    backend = RecordingEventBackend(max_events=0)
+    position = backend.get_mouse_position()
+    start = time.perf_counter_ns()
+    for _ in range(clicks):
+        mouse_down = backend.create_mouse_down(position, "left")
+        backend.post(mouse_down)
+        mouse_up = backend.create_mouse_up(position, "left")
+        backend.post(mouse_up)
+    elapsed = time.perf_counter_ns() - start
+    results["uncached"] = {
+        "ns_per_click": elapsed / clicks,
+        "events_created_per_click": backend.created_events / clicks
+    }
+
+    backend = RecordingEventBackend(max_events=0)
+    position = backend.get_mouse_position()
+    cache = MouseEventCache(backend)
+    start = time.perf_counter_ns()
+    for _ in range(clicks):
+        mouse_down, mouse_up = cache.get(position, "left")
+        backend.post(mouse_down)
+        backend.post(mouse_up)
+    elapsed = time.perf_counter_ns() - start
+    results["cached"] = {
+        "ns_per_click": elapsed / clicks,
+        "events_created_per_click": backend.created_events / clicks
+    }
+
+    return results
+
+
+def _percentiles_us(values):
+    if not values:
+        return {"p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+    values = sorted(values)
+    return {
+        "p50_us": values[len(values) // 2] / 1000.0,
+        "p99_us": values[min(len(values) - 1, int(len(values) * 0.99))] / 1000.0,
+        "max_us": values[-1] / 1000.0
+    }
+
+
+def bench_channels(channel_counts=(1, 8, 64), duration=2.0, precise=False):
+    """Measure press lateness of the single-thread scheduler with many channels"""
+    results = {}
+    for count in channel_counts:
+        backend = RecordingEventBackend()
+        scheduler = ClickScheduler(backend)
+        scheduler.precise = precise
+        start_ns = time.perf_counter_ns() + 10_000_000
+        channels = []
+        for index in range(count):
+            channel = ClickChannel(
+                f"channel {index}",
+                interval_ms=5.0 + (index % 8) * 5.0,
+                position=(index, 0)
+            )
+            channels.append(scheduler.add_channel(channel, start_ns))
+
+        stop_event = threading.Event()
+        timer = threading.Timer(duration, stop_event.set)
+        timer.start()
+        scheduler.run(stop_event)
+        timer.cancel()
+
+        presses = {}
+        for timestamp, kind, _, x, _ in backend.events:
+            if kind == "down":
+                presses.setdefault(int(x), []).append(timestamp)
+
+        lateness = []
+        achieved = 0
+        expected = 0
+        for index, channel in enumerate(channels):
+            timestamps = presses.get(index, [])
+            achieved += len(timestamps)
+            expected += int(duration * 1e9 / channel.interval_ns)
+            for n, timestamp in enumerate(timestamps):
+                lateness.append(max(0, timestamp - (channel.t0 + n * channel.interval_ns)))
+
+        result = {"presses": achieved, "rate_ratio": achieved / max(1, expected)}
+        result.update(_percentiles_us(lateness))
+        results[f"{count} channels"] = result
+    return results
+
+
+def engine_cases(intervals=ENGINE_INTERVALS_MS, duty_cycles=ENGINE_DUTY_CYCLES, hold_times=ENGINE_HOLD_TIMES_MS):
+    """Return (name, settings) for every interval, duty cycle, hold time and movement-pause combination"""
+    cases = []
+    for interval_ms in intervals:
+        press_settings = [(f"duty={duty:g}%", {"duty_cycle": duty, "hold_time": 0.0}) for duty in duty_cycles]
+        press_settings += [
+            (f"hold={hold:g}ms", {"hold_time": hold})
+            for hold in hold_times if hold < interval_ms
+        ]
+        for press_name, press in press_settings:
+            for pause_on_movement in (False, True):
+                settings = {
+                    "interval_ms": interval_ms,
+                    "timing_mode": "precise" if interval_ms < MIN_INTERVAL_MS else "sleep",
+                    "pause_on_movement": pause_on_movement,
+                    "auto_calibrate": False
+                }
+                settings.update(press)
+                name = f"interval={interval_ms:g}ms {press_name} pause={'on' if pause_on_movement else 'off'}"
+                cases.append((name, settings))
+    return cases
+
+
+def bench_engine(duration=2.0, precise=False, cases=None):
+    """Run AdvancedClickerEngine on the recording backend for every case in the matrix"""
+    results = {}
+    for name, settings in (cases if cases is not None else engine_cases()):
+        settings = dict(settings)
+        if precise:
+            settings["timing_mode"] = "precise"
+        backend = RecordingEventBackend(max_events=1)
+        engine = AdvancedClickerEngine(settings, backend=backend)
+
+        start = time.perf_counter_ns()
+        engine.start_clicking()
+        time.sleep(duration)
+        stop = time.perf_counter_ns()
+        engine.stop_clicking()
+        stopped = time.perf_counter_ns()
+        if not engine.idle_event.is_set():
+            print(f"Warning: click thread still running after stop ({name})")
+        engine.shutdown()
+
+        stats = engine.get_timing_stats()
+        first_press = backend.events[0][0] if backend.events else stop
+        interval_ns = engine.plan.interval_ns
+        results[name] = {
+            "cps": stats["achieved_cps"],
+            "cps_ratio": stats["achieved_cps"] * interval_ns / 1e9,
+            "lateness_p50_us": stats["lateness_p50_us"],
+            "lateness_p99_us": stats["lateness_p99_us"],
+            "lateness_max_us": stats["lateness_max_us"],
+            "cpu_us_per_click": stats["cpu_us_per_click"],
+            "start_latency_us": (first_press - start) / 1000.0,
+            "first_press_latency_us": stats["start_latency_us"],
+            "stop_latency_us": (stopped - stop) / 1000.0
+        }
+    return results
+
+
+def bench_stop(intervals=STOP_INTERVALS_MS, trials=10, schedule_modes=("deadline", "relative")):
+    """Measure how long stop_clicking takes and check that no button is left pressed
+
+    The hold time is half the interval, so a stop usually lands while the
+    button is down or during a long wait. It must not wait for either.
+    """
+    results = {}
+    for schedule_mode in schedule_modes:
+        for interval_ms in intervals:
+            settings = {
+                "interval_ms": interval_ms,
+                "hold_time": interval_ms / 2.0,
+                "schedule_mode": schedule_mode,
+                "pause_on_movement": False,
+                "auto_calibrate": False
+            }
+            backend = RecordingEventBackend()
+            engine = AdvancedClickerEngine(settings, backend=backend)
+            rng = random.Random(interval_ms)
+            stop_latencies = []
+            release_latencies = []
+            released = 0
+            for _ in range(trials):
+                backend.clear()
+                engine.start_clicking()
+                time.sleep(rng.uniform(0.02, 0.1))
+                stop = time.perf_counter_ns()
+                engine.stop_clicking()
+                stop_latencies.append(time.perf_counter_ns() - stop)
+
+                downs = sum(1 for event in backend.events if event[1] == "down")
+                ups = [event[0] for event in backend.events if event[1] == "up"]
+                if downs == len(ups):
+                    released += 1
+                if ups and ups[-1] >= stop:
+                    release_latencies.append(ups[-1] - stop)
+
+            engine.shutdown()
+            stop_percentiles = _percentiles_us(stop_latencies)
+            result = {
+                "stop_p50_us": stop_percentiles["p50_us"],
+                "stop_max_us": stop_percentiles["max_us"],
+                "release_max_us": _percentiles_us(release_latencies)["max_us"],
+                "released_ratio": released / trials
+            }
+            results[f"{schedule_mode} interval={interval_ms:g}ms"] = result
+    return results
+
+
+def _key_stream(events, seed=1):
+    from hotkey_manager import Key, KeyCode
+
+    rng = random.Random(seed)
+    pool = [KeyCode.from_char(char) for char in "abcdefghijklmnopqrstuvwxyz0123456789"]
+    pool += [KeyCode.from_vk(vk) for vk in range(65, 91)]
+    pool += [Key.shift, Key.ctrl, Key.alt, Key.cmd, Key.space, Key.enter, Key.tab, Key.f6]
+    hotkey = [KeyCode.from_char("z"), KeyCode.from_char("1")]
+
+    stream = []
+    while len(stream) < events:
+        if rng.random() < 0.05:
+            keys = hotkey
+        else:
+            keys = [rng.choice(pool)]
+        stream.extend((True, key) for key in keys)
+        if keys is hotkey:
+            stream.extend((True, keys[-1]) for _ in range(3))
+        stream.extend((False, key) for key in reversed(keys))
+    return stream[:events]
+
+
+def bench_hotkeys(events=100000):
+    """Measure per-event cost of the hotkey listener callbacks on a synthetic key stream"""
+    from hotkey_manager import EnhancedHotkeyManager, Key, key_to_string
+
+    if Key is None:
+        print("pynput is not available, skipping the hotkey benchmark")
+        return {}
+
+    stream = _key_stream(events)
+    settings = {"hotkey": {"type": "keyboard", "keys": ["z", "1"]}, "mode": "toggle"}
+    results = {}
+
+    fired = [0]
+    current_keys = set()
+
+    def string_press(key):
+        key_str = key_to_string(key)
+        if key_str:
+            hotkey_keys = set(settings["hotkey"].get("keys", []))
+            current_keys.add(key_str)
+            if hotkey_keys and hotkey_keys.issubset(current_keys):
+                fired[0] += 1
+
+    def string_release(key):
+        key_str = key_to_string(key)
+        if key_str and key_str in current_keys:
+            current_keys.remove(key_str)
+
+    start = time.perf_counter_ns()
+    for pressed, key in stream:
+        if pressed:
+            string_press(key)
+        else:
+            string_release(key)
+    elapsed = time.perf_counter_ns() - start
+    results["string sets"] = {"ns_per_event": elapsed / len(stream), "hotkeys": fired[0]}
+
+    def replay(callback, settings, actions=None):
+        manager = EnhancedHotkeyManager(callback, settings, listen=False, actions=actions)
+        on_press = manager.on_press
+        on_release = manager.on_release
+        fired[0] = 0
+        start = time.perf_counter_ns()
+        for pressed, key in stream:
+            if pressed:
+                on_press(key)
+            else:
+                on_release(key)
+        elapsed = time.perf_counter_ns() - start
+        manager.flush(timeout=60.0)
+        metrics = manager.get_metrics()
+        manager.shutdown()
+        return {
+            "ns_per_event": elapsed / len(stream),
+            "hotkeys": fired[0],
+            "repeats_dropped": metrics["repeats_dropped"],
+            "callback_p99_us": metrics["callback_p99_us"],
+            "callback_max_us": metrics["callback_max_us"],
+            "dispatch_p99_us": metrics["dispatch_p99_us"]
+        }
+
+    def count(state):
+        fired[0] += 1
+
+    results["bitmask"] = replay(count, settings)
+
+    names = "abcdefghijklmnopqrstuvwxy"
+    bindings = [{"keys": [first, second], "action": "count"} for first in names[:8] for second in "0123456789"]
+    many = dict(settings, hotkey_bindings=bindings)
+    results[f"bitmask, {len(bindings) + 1} bindings"] = replay(count, many, {"count": lambda state, binding: None})
+
+    def slow_count(state):
+        time.sleep(0.001)
+        fired[0] += 1
+
+    results["bitmask, 1ms action"] = replay(slow_count, settings)
+
+    manager = EnhancedHotkeyManager(count, many, listen=False, actions={"count": lambda state, binding: None})
+    rebinds = []
+    for index in range(1000):
+        manager.update_settings(dict(many, mode="hold" if index % 2 else "toggle"))
+        rebinds.append(manager.rebind_ns)
+    manager.shutdown()
+    rebinds.sort()
+    results[f"rebind, {len(bindings) + 1} bindings"] = {
+        "rebind_p50_us": rebinds[len(rebinds) // 2] / 1000.0,
+        "rebind_p99_us": rebinds[len(rebinds) * 99 // 100] / 1000.0,
+        "rebind_max_us": rebinds[-1] / 1000.0
+    }
+    return results
+
+
+def bench_mouse_hotkeys(duration=2.0, rate=1000, events=100000):
+    """Run the mouse hotkey callbacks under a synthetic mouse-move stream
+
+    Events go through the same steps as pynput's Windows hook handler: the
+    hook filter, then the move or click callback. The stream is mostly
+    moves with a side button held for half of every second. The paced run
+    is repeated for the macOS event tap, which is not subscribed to moves,
+    so only the button events reach the listener.
+    """
+    from types import SimpleNamespace
+    from hotkey_manager import (
+        DARWIN_BUTTON_NAMES, WM_MOUSEMOVE, EnhancedHotkeyManager, Key, mouse_event_filter
+    )
+
+    if Key is None:
+        print("pynput is not available, skipping the mouse hotkey benchmark")
+        return {}
+
+    wm_xbuttondown = 0x020B
+    wm_xbuttonup = 0x020C
+    x1 = SimpleNamespace(name="x1")
+    fired = [0]
+    settings = {"hotkey": {"type": "mouse", "keys": ["mouse_x1"]}, "mode": "hold"}
+    manager = EnhancedHotkeyManager(lambda state: fired.__setitem__(0, fired[0] + 1), settings, listen=False)
+    on_move = lambda *args: None
+
+    def deliver(msg, filtered):
+        if filtered and mouse_event_filter(msg, None) is False:
+            return
+        if msg == WM_MOUSEMOVE:
+            on_move(100, 100, False)
+        else:
+            manager.on_click(100, 100, x1, msg == wm_xbuttondown, False)
+
+    def deliver_darwin(msg):
+        manager.on_mouse_button(DARWIN_BUTTON_NAMES[3], msg == wm_xbuttondown)
+
+    def stream_event(tick):
+        if tick % rate == 0:
+            return wm_xbuttondown
+        if tick % rate == rate // 2:
+            return wm_xbuttonup
+        return WM_MOUSEMOVE
+
+    results = {}
+    for filtered in (False, True):
+        start = time.perf_counter_ns()
+        for _ in range(events):
+            deliver(WM_MOUSEMOVE, filtered)
+        elapsed = time.perf_counter_ns() - start
+        results["moves, hook filter" if filtered else "moves, no filter"] = {"ns_per_event": elapsed / events}
+
+    def paced(deliver, tapped):
+        manager.reset_keys()
+        manager.flush()
+        fired[0] = 0
+        manager.reset_metrics()
+        period_ns = 1_000_000_000 // rate
+        ticks = int(duration * rate)
+        delivered = 0
+        cpu_ns = 0
+        start = time.perf_counter_ns()
+        for tick in range(ticks):
+            due_ns = start + tick * period_ns
+            wait = due_ns - time.perf_counter_ns()
+            if wait > 0:
+                time.sleep(wait / 1e9)
+            msg = stream_event(tick)
+            if not tapped(msg):
+                continue
+            delivered += 1
+            cpu_start = time.thread_time_ns()
+            deliver(msg)
+            cpu_ns += time.thread_time_ns() - cpu_start
+        elapsed = time.perf_counter_ns() - start
+        manager.flush()
+        metrics = manager.get_metrics()
+        return {
+            "rate_ratio": ticks * 1e9 / elapsed / rate,
+            "events_delivered": delivered,
+            "cpu_us_per_event": cpu_ns / ticks / 1000.0,
+            "listener_cpu_percent": cpu_ns * 100.0 / elapsed,
+            "hotkeys": fired[0],
+            "callback_p99_us": metrics["callback_p99_us"],
+            "dispatch_p99_us": metrics["dispatch_p99_us"]
+        }
+
+    results[f"paced {rate} Hz"] = paced(lambda msg: deliver(msg, True), lambda msg: True)
+    results[f"paced {rate} Hz, macOS tap"] = paced(deliver_darwin, lambda msg: msg != WM_MOUSEMOVE)
+    manager.shutdown()
+    return results
+
+
+def _metric_direction(metric):
+    if any(metric.endswith(suffix) for suffix in LOWER_IS_BETTER):
+        return -1
+    if any(metric.endswith(suffix) for suffix in HIGHER_IS_BETTER):
+        return 1
+    return 0
+
+
+def compare_results(baseline, current, tolerance=0.2):
+    """Return (case, metric, baseline, current) for every metric that got worse by more than tolerance"""
+    regressions = []
+    for case, baseline_values in baseline.get("results", {}).items():
+        current_values = current.get("results", {}).get(case)
+        if current_values is None:
+            continue
+        for metric, old in baseline_values.items():
+            new = current_values.get(metric)
+            direction = _metric_direction(metric)
+            if new is None or not direction or old <= 0:
+                continue
+            change = (new - old) / old * direction
+            if change < -tolerance:
+                regressions.append((case, metric, old, new))
+    return regressions
+
+
+def save_results(file_path, benchmark, results):
+    """Save results together with the machine they were measured on"""
+    data = {
+        "benchmark": benchmark,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "python_version": platform.python_version(),
+        "timestamp": time.time(),
+        "results": results
+    }
+    with open(file_path, 'w') as f:
+        json.dump(data, f, indent=4)
+
+
+def print_results(title, results):
+    print(title)
+    for name, values in results.items():
+        formatted = ", ".join(f"{key}={value:.3f}" for key, value in values.items())
+        print(f"  {name}: {formatted}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Aerout SpeedAutoClicker benchmarks")
+    parser.add_argument("benchmark", choices=["events", "channels", "engine", "stop", "hotkeys", "mouse", "compare"], help="benchmark to run")
+    parser.add_argument("--clicks", type=int, default=100000, help="number of clicks to simulate")
+    parser.add_argument("--events", type=int, default=100000, help="number of key events to simulate")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds to run timed benchmarks")
+    parser.add_argument("--precise", action="store_true", help="use the sleep/spin precision timer")
+    parser.add_argument("--output", help="save the results as JSON to this file")
+    parser.add_argument("--baseline", help="baseline JSON file for compare")
+    parser.add_argument("--current", help="current JSON file for compare")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression for compare")
+    args = parser.parse_args()
+
+    if args.benchmark == "compare":
+        if not args.baseline or not args.current:
+            parser.error("compare needs --baseline and --current")
+        try:
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+            with open(args.current, 'r') as f:
+                current = json.load(f)
+        except Exception as e:
+            print(f"Error loading benchmark results: {e}")
+            return 2
+        regressions = compare_results(baseline, current, args.tolerance)
+        for case, metric, old, new in regressions:
+            print(f"REGRESSION {case}: {metric} {old:.3f} -> {new:.3f}")
+        if not regressions:
+            print(f"No regressions beyond {args.tolerance * 100:.0f}%")
+        return 1 if regressions else 0
+
+    if args.benchmark == "events":
+        title = f"Event creation ({args.clicks} clicks)"
+        results = bench_event_cache(args.clicks)
+    elif args.benchmark == "channels":
+        title = f"Scheduler accuracy ({args.duration:.1f}s per case)"
+        results = bench_channels(duration=args.duration, precise=args.precise)
+    elif args.benchmark == "engine":
+        title = f"Engine matrix ({args.duration:.1f}s per case)"
+        results = bench_engine(duration=args.duration, precise=args.precise)
+    elif args.benchmark == "stop":
+        title = "Stop latency"
+        results = bench_stop()
+    elif args.benchmark == "hotkeys":
+        title = f"Hotkey matching ({args.events} key events)"
+        results = bench_hotkeys(args.events)
+    else:
+        title = f"Mouse hotkeys ({args.duration:.1f}s at 1000 Hz)"
+        results = bench_mouse_hotkeys(args.duration, events=args.events)
+
+    print_results(title, results)
+    if args.output:
+        save_results(args.output, args.benchmark, results)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Event backends for Aerout SpeedAutoClicker
+Creates, posts and reads mouse events for the click engine
+"""
+
+import time
+import threading
+from collections import namedtuple
+
+Point = namedtuple("Point", ["x", "y"])
+
+BUTTON_TYPES = ("left", "right", "middle")
+
+EVENT_UP = 0
+EVENT_DOWN = 1
+
+
+class EventBackend:
+    """Interface the click engine uses to talk to the OS"""
+
+    name = "base"
+
+    def create_mouse_down(self, position, button_type="left"):
+        """Create a mouse-down event for the given button at position"""
+        raise NotImplementedError
+
+    def create_mouse_up(self, position, button_type="left"):
+        """Create a mouse-up event for the given button at position"""
+        raise NotImplementedError
+
+    def create_mouse_move(self, position):
+        """Create an event that moves the cursor to position"""
+        raise NotImplementedError
+
+    def create_scroll(self, dx, dy):
+        """Create a scroll-wheel event of dx/dy pixels"""
+        raise NotImplementedError
+
+    def create_key(self, key_code, down=True):
+        """Create a key-down or key-up event for a virtual key code"""
+        raise NotImplementedError
+
+    def set_location(self, event, position):
+        """Move an already created event to a new position"""
+        raise NotImplementedError
+
+    def post(self, event):
+        """Post a previously created event"""
+        raise NotImplementedError
+
+    def get_mouse_position(self):
+        """Return the current cursor position as an object with x and y"""
+        raise NotImplementedError
+
+
+class QuartzEventBackend(EventBackend):
+    """Backend that posts real mouse events through Quartz on macOS"""
+
+    name = "quartz"
+
+    def __init__(self):
+        """Import Quartz and create the HID event source"""
+        import Quartz
+
+        self.quartz = Quartz
+        self.event_source = Quartz.CGEventSourceCreate(Quartz.kCGEventSourceStateHIDSystemState)
+        self.button_map = {
+            "left": {
+                "down": Quartz.kCGEventLeftMouseDown,
+                "up": Quartz.kCGEventLeftMouseUp,
+                "button": Quartz.kCGMouseButtonLeft
+            },
+            "right": {
+                "down": Quartz.kCGEventRightMouseDown,
+                "up": Quartz.kCGEventRightMouseUp,
+                "button": Quartz.kCGMouseButtonRight
+            },
+            "middle": {
+                "down": Quartz.kCGEventOtherMouseDown,
+                "up": Quartz.kCGEventOtherMouseUp,
+                "button": Quartz.kCGMouseButtonCenter
+            }
+        }
+
+    def _create(self, position, button_type, direction):
+        button_info = self.button_map.get(button_type, self.button_map["left"])
+        return self.quartz.CGEventCreateMouseEvent(
+            self.event_source,
+            button_info[direction],
+            (position[0], position[1]),
+            button_info["button"]
+        )
+
+    def create_mouse_down(self, position, button_type="left"):
+        return self._create(position, button_type, "down")
+
+    def create_mouse_up(self, position, button_type="left"):
+        return self._create(position, button_type, "up")
+
+    def create_mouse_move(self, position):
+        return self.quartz.CGEventCreateMouseEvent(
+            self.event_source,
+            self.quartz.kCGEventMouseMoved,
+            (position[0], position[1]),
+            self.quartz.kCGMouseButtonLeft
+        )
+
+    def create_scroll(self, dx, dy):
+        return self.quartz.CGEventCreateScrollWheelEvent(
+            self.event_source,
+            self.quartz.kCGScrollEventUnitPixel,
+            2,
+            int(dy),
+            int(dx)
+        )
+
+    def create_key(self, key_code, down=True):
+        return self.quartz.CGEventCreateKeyboardEvent(self.event_source, key_code, down)
+
+    def set_location(self, event, position):
+        self.quartz.CGEventSetLocation(event, (position[0], position[1]))
+
+    def post(self, event):
+        self.quartz.CGEventPost(self.quartz.kCGHIDEventTap, event)
+
+    def get_mouse_position(self):
+        event = self.quartz.CGEventCreate(None)
+        location = self.quartz.CGEventGetLocation(event)
+        return Point(location.x, location.y)
+
+
+class RecordedEvent:
+    """Mutable stand-in for a native input event
+
+    Scroll events keep their deltas in x/y, key events their key code in button.
+    """
+
+    __slots__ = ("kind", "button", "x", "y")
+
+    def __init__(self, kind, button, x, y):
+        self.kind = kind
+        self.button = button
+        self.x = x
+        self.y = y
+
+
+class RecordingEventBackend(EventBackend):
+    """In-memory backend that timestamps every posted event
+
+    Nothing reaches the OS, so the engine can be driven and measured on
+    headless machines. Posted events are kept in ``self.events`` as
+    ``(perf_counter_ns, kind, button, x, y)`` tuples.
+    """
+
+    name = "recording"
+
+    def __init__(self, position=(0, 0), max_events=None):
+        """Initialize the backend with a fixed cursor position"""
+        self.position = Point(*position)
+        self.max_events = max_events
+        self.events = []
+        self.created_events = 0
+        self.lock = threading.Lock()
+
+    def create_mouse_down(self, position, button_type="left"):
+        self.created_events += 1
+        return RecordedEvent("down", button_type, position[0], position[1])
+
+    def create_mouse_up(self, position, button_type="left"):
+        self.created_events += 1
+        return RecordedEvent("up", button_type, position[0], position[1])
+
+    def create_mouse_move(self, position):
+        self.created_events += 1
+        return RecordedEvent("move", None, position[0], position[1])
+
+    def create_scroll(self, dx, dy):
+        self.created_events += 1
+        return RecordedEvent("scroll", None, dx, dy)
+
+    def create_key(self, key_code, down=True):
+        self.created_events += 1
+        return RecordedEvent("key_down" if down else "key_up", key_code, 0, 0)
+
+    def set_location(self, event, position):
+        event.x = position[0]
+        event.y = position[1]
+
+    def post(self, event):
+        timestamp = time.perf_counter_ns()
+        with self.lock:
+            if self.max_events is None or len(self.events) < self.max_events:
+                self.events.append((timestamp, event.kind, event.button, event.x, event.y))
+
+    def get_mouse_position(self):
+        return self.position
+
+    def move_to(self, x, y):
+        """Move the simulated cursor"""
+        self.position = Point(x, y)
+
+    def clear(self):
+        """Forget all recorded events"""
+        with self.lock:
+            self.events = []
+
+    def timestamps(self, kind="down"):
+        """Return post timestamps (ns) of all recorded events of one kind"""
+        with self.lock:
+            return [event[0] for event in self.events if event[1] == kind]
+
+
+class MouseEventCache:
+    """Keeps one down/up event pair per button and reuses it for every click
+
+    Events are only moved when the click position changes, so steady-state
+    clicking creates no new native objects.
+    """
+
+    def __init__(self, backend):
+        """Initialize an empty cache for the given backend"""
+        self.backend = backend
+        self.entries = {}
+
+    def get(self, position, button_type="left"):
+        """Return the (down, up) events for button_type placed at position"""
+        x = position[0]
+        y = position[1]
+        entry = self.entries.get(button_type)
+        if entry is None:
+            entry = [
+                self.backend.create_mouse_down(position, button_type),
+                self.backend.create_mouse_up(position, button_type),
+                x,
+                y
+            ]
+            self.entries[button_type] = entry
+        elif entry[2] != x or entry[3] != y:
+            self.backend.set_location(entry[0], position)
+            self.backend.set_location(entry[1], position)
+            entry[2] = x
+            entry[3] = y
+        return entry[0], entry[1]
+
+    def get_at(self, x, y, button_type="left"):
+        """Like get(), but builds a Point only when the events have to move"""
+        entry = self.entries.get(button_type)
+        if entry is None or entry[2] != x or entry[3] != y:
+            return self.get(Point(x, y), button_type)
+        return entry[0], entry[1]
+
+    def clear(self):
+        """Drop all cached events"""
+        self.entries = {}
+
+
+def create_default_backend():
+    """Return the Quartz backend, the only one that produces real clicks"""
+    return QuartzEventBackend()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Humanized timing for Aerout SpeedAutoClicker
+Pre-generates randomized interval and press-time factors in blocks
+"""
+
+import math
+import random
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DISTRIBUTIONS = ("normal", "lognormal", "uniform")
+
+
+class JitterGenerator:
+    """Hands out random (interval_factor, press_factor) pairs by index
+
+    Factors multiply the nominal interval and press time. They have a mean
+    of 1.0 and a standard deviation of spread, and are clipped to
+    [min_factor, max_factor]. They are drawn block_size at a time with NumPy
+    (or the random module if NumPy is missing). A background thread fills
+    the next block while the current one is being used. Blocks are always
+    generated in order from one seeded RNG, so a seed gives the same
+    sequence no matter how the refills are timed.
+    """
+
+    def __init__(self, distribution="normal", spread=0.1, min_factor=0.5, max_factor=1.5, seed=None, block_size=4096):
+        """Initialize the generator and fill the first two blocks"""
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown jitter distribution: {distribution}")
+        self.distribution = distribution
+        self.spread = max(0.0, float(spread))
+        self.min_factor = float(min_factor)
+        self.max_factor = max(self.min_factor, float(max_factor))
+        self.block_size = max(1, int(block_size))
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+        self.intervals, self.presses = self._generate()
+        self.index = 0
+        self.spare = None
+        self.closed = False
+        self.refill_needed = threading.Event()
+        self.refill_done = threading.Event()
+        self.refill_needed.set()
+        self.thread = threading.Thread(target=self._refill_loop, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Return a generator for the humanize settings, or None if disabled"""
+        if not settings.get("humanize_enabled", False):
+            return None
+        return cls(
+            distribution=settings.get("humanize_distribution", "normal"),
+            spread=settings.get("humanize_spread", 0.1),
+            min_factor=settings.get("humanize_min_factor", 0.5),
+            max_factor=settings.get("humanize_max_factor", 1.5),
+            seed=settings.get("humanize_seed")
+        )
+
+    def _generate(self):
+        count = self.block_size * 2
+        spread = self.spread
+        if np is not None:
+            if self.distribution == "normal":
+                factors = self.rng.normal(1.0, spread, count)
+            elif self.distribution == "lognormal":
+                factors = self.rng.lognormal(-spread * spread / 2.0, spread, count)
+            else:
+                half_width = spread * math.sqrt(3.0)
+                factors = self.rng.uniform(1.0 - half_width, 1.0 + half_width, count)
+            factors = np.clip(factors, self.min_factor, self.max_factor).tolist()
+        else:
+            if self.distribution == "normal":
+                factors = [self.rng.gauss(1.0, spread) for _ in range(count)]
+            elif self.distribution == "lognormal":
+                factors = [self.rng.lognormvariate(-spread * spread / 2.0, spread) for _ in range(count)]
+            else:
+                half_width = spread * math.sqrt(3.0)
+                factors = [self.rng.uniform(1.0 - half_width, 1.0 + half_width) for _ in range(count)]
+            factors = [min(self.max_factor, max(self.min_factor, factor)) for factor in factors]
+        return factors[:self.block_size], factors[self.block_size:]
+
+    def _refill_loop(self):
+        while True:
+            self.refill_needed.wait()
+            self.refill_needed.clear()
+            if self.closed:
+                return
+            self.spare = self._generate()
+            self.refill_done.set()
+
+    def _swap(self):
+        self.refill_done.wait()
+        self.refill_done.clear()
+        spare = self.spare
+        if spare is None:
+            spare = self._generate()
+        self.intervals, self.presses = spare
+        self.spare = None
+        self.refill_needed.set()
+
+    def next(self):
+        """Return the next (interval_factor, press_factor) pair"""
+        index = self.index
+        if index >= self.block_size:
+            self._swap()
+            index = 0
+        self.index = index + 1
+        return self.intervals[index], self.presses[index]
+
+    def close(self):
+        """Stop the refill thread; next() keeps working, refilling on the caller's thread"""
+        self.closed = True
+        self.refill_needed.set()
+        self.refill_done.set()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Process-isolated click engine for Aerout SpeedAutoClicker
+Runs AdvancedClickerEngine in a child process controlled through shared memory
+"""
+
+import os
+import json
+import time
+import struct
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+from click_stats import ClickTimingStats
+from click_timing import calibrate_sleep
+from macro_recorder import MacroRecorder
+
+COMMAND_STOP = 0
+COMMAND_RUN = 1
+COMMAND_SHUTDOWN = 2
+
+PUBLISH_INTERVAL = 0.02
+IDLE_INTERVAL = 0.5
+MONITOR_INTERVAL = 0.05
+STOP_TIMEOUT = 1.0
+
+HEADER_FIELDS = (
+    "command_seq", "command", "settings_seq", "settings_len",
+    "publish_seq", "ack_seq", "running", "click_count", "missed_deadlines", "status_len"
+)
+STATS_KEYS = tuple(ClickTimingStats().summary().keys())
+STATUS_SIZE = 4096
+SETTINGS_SIZE = 65536
+
+HEADER = struct.Struct("<" + "q" * len(HEADER_FIELDS))
+STATS = struct.Struct("<" + "d" * len(STATS_KEYS))
+STATS_OFFSET = HEADER.size
+STATUS_OFFSET = STATS_OFFSET + STATS.size
+SETTINGS_OFFSET = STATUS_OFFSET + STATUS_SIZE
+BLOCK_SIZE = SETTINGS_OFFSET + SETTINGS_SIZE
+
+
+class ControlBlock:
+    """Fixed layout of the shared memory block between the GUI and the engine process
+
+    The parent owns the command and settings fields; the child owns every
+    published field (counters, timing stats and the status JSON). Each side
+    guards its multi-field writes with a sequence number that is odd while a
+    write is in progress, so readers retry instead of seeing a torn update.
+    """
+
+    def __init__(self, name=None):
+        """Create a new block, or attach to an existing one by name"""
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE)
+            self.shm.buf[:HEADER.size] = bytes(HEADER.size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self.offsets = {field: index * 8 for index, field in enumerate(HEADER_FIELDS)}
+
+    def get(self, field):
+        return struct.unpack_from("<q", self.buf, self.offsets[field])[0]
+
+    def set(self, field, value):
+        struct.pack_into("<q", self.buf, self.offsets[field], int(value))
+
+    def _read_consistent(self, seq_field, read):
+        while True:
+            before = self.get(seq_field)
+            if before & 1:
+                time.sleep(0)
+                continue
+            value = read()
+            if self.get(seq_field) == before:
+                return before, value
+
+    def write_settings(self, settings):
+        """Publish a settings dict for the child; returns False if it does not fit"""
+        data = json.dumps(settings).encode("utf-8")
+        if len(data) > SETTINGS_SIZE:
+            print(f"Error sending settings to engine process: {len(data)} bytes is too large")
+            return False
+        seq = self.get("settings_seq")
+        self.set("settings_seq", seq + 1)
+        self.buf[SETTINGS_OFFSET:SETTINGS_OFFSET + len(data)] = data
+        self.set("settings_len", len(data))
+        self.set("settings_seq", seq + 2)
+        return True
+
+    def read_settings(self):
+        """Return (settings_seq, settings dict)"""
+        def read():
+            length = self.get("settings_len")
+            return bytes(self.buf[SETTINGS_OFFSET:SETTINGS_OFFSET + length])
+        seq, data = self._read_consistent("settings_seq", read)
+        return seq, json.loads(data.decode("utf-8")) if data else {}
+
+    def send_command(self, command):
+        self.set("command", command)
+        self.set("command_seq", self.get("command_seq") + 1)
+
+    def publish(self, ack_seq, running, click_count, missed_deadlines, stats, status=None):
+        """Publish the child's counters, timing stats and optionally the status JSON"""
+        seq = self.get("publish_seq")
+        self.set("publish_seq", seq + 1)
+        self.set("ack_seq", ack_seq)
+        self.set("running", running)
+        self.set("click_count", click_count)
+        self.set("missed_deadlines", missed_deadlines)
+        STATS.pack_into(self.buf, STATS_OFFSET, *(float(stats.get(key) or 0.0) for key in STATS_KEYS))
+        if status is not None:
+            data = json.dumps(status).encode("utf-8")[:STATUS_SIZE]
+            self.buf[STATUS_OFFSET:STATUS_OFFSET + len(data)] = data
+            self.set("status_len", len(data))
+        self.set("publish_seq", seq + 2)
+
+    def read_published(self):
+        """Return the child's published fields as a dict"""
+        def read():
+            values = {
+                "ack_seq": self.get("ack_seq"),
+                "running": self.get("running"),
+                "click_count": self.get("click_count"),
+                "missed_deadlines": self.get("missed_deadlines"),
+                "stats": dict(zip(STATS_KEYS, STATS.unpack_from(self.buf, STATS_OFFSET)))
+            }
+            length = self.get("status_len")
+            values["status"] = bytes(self.buf[STATUS_OFFSET:STATUS_OFFSET + length])
+            return values
+        _, values = self._read_consistent("publish_seq", read)
+        values["status"] = json.loads(values["status"].decode("utf-8")) if values["status"] else {}
+        return values
+
+    def close(self, unlink=False):
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _engine_process_main(shm_name, wake_event, backend_factory=None):
+    """Entry point of the engine process"""
+    from clicker_engine import AdvancedClickerEngine
+
+    block = ControlBlock(shm_name)
+    parent = os.getppid()
+    settings_seq, settings = block.read_settings()
+    status = {"status": None, "status_count": 0}
+
+    def on_status(text):
+        status["status"] = text
+        status["status_count"] += 1
+
+    backend = backend_factory() if backend_factory is not None else None
+    engine = AdvancedClickerEngine(dict(settings, auto_calibrate=False), status_callback=on_status, backend=backend)
+    ack_seq = 0
+    published_status = None
+
+    try:
+        while os.getppid() == parent:
+            wake_event.wait(PUBLISH_INTERVAL if engine.clicking else IDLE_INTERVAL)
+            wake_event.clear()
+
+            if block.get("settings_seq") != settings_seq:
+                settings_seq, settings = block.read_settings()
+                engine.update_settings(dict(settings, auto_calibrate=False))
+                engine.apply_calibration(settings.get("timing_calibration"))
+
+            command_seq = block.get("command_seq")
+            if command_seq != ack_seq:
+                command = block.get("command")
+                if command == COMMAND_SHUTDOWN:
+                    break
+                if command == COMMAND_RUN:
+                    engine.start_clicking()
+                else:
+                    engine.stop_clicking()
+                ack_seq = command_seq
+
+            current_status = dict(
+                status,
+                priority_status=engine.priority_status,
+                sequence_clicks=engine.get_sequence_clicks(),
+                controller=engine.get_controller_state()
+            )
+            block.publish(
+                ack_seq,
+                engine.clicking,
+                engine.click_count,
+                engine.missed_deadlines,
+                engine.get_timing_stats(),
+                current_status if current_status != published_status else None
+            )
+            published_status = current_status
+    finally:
+        engine.shutdown()
+        block.publish(ack_seq, False, engine.click_count, engine.missed_deadlines, engine.get_timing_stats())
+        block.close()
+
+
+class ProcessClickerEngine:
+    """Drop-in stand-in for AdvancedClickerEngine that runs it in a child process
+
+    Commands and settings go to the child through the shared ControlBlock
+    and a wake-up event; counters and timing stats are read straight from
+    shared memory, so the GUI never waits on the clicker and the clicker
+    never shares the GUI's GIL. Status messages are polled by a small
+    monitor thread and handed to status_callback.
+    """
+
+    def __init__(self, settings, status_callback=None, backend=None, save_callback=None, backend_factory=None):
+        """Start the engine process"""
+        self.settings = settings
+        self.status_callback = status_callback
+        self.save_callback = save_callback
+        self.backend = backend
+        self.macro_recorder = None
+        self.block = ControlBlock()
+        self.block.write_settings(self.settings)
+        self.context = multiprocessing.get_context("spawn")
+        self.wake_event = self.context.Event()
+        self.command = COMMAND_STOP
+        self.command_seq = 0
+        self.status_count = 0
+        self.closed = False
+
+        if self.backend is None:
+            from click_backends import create_default_backend
+            self.backend = create_default_backend()
+
+        if self.settings.get("auto_calibrate", True):
+            self.calibrate()
+
+        self.process = self.context.Process(
+            target=_engine_process_main,
+            args=(self.block.name, self.wake_event, backend_factory),
+            daemon=True
+        )
+        self.process.start()
+        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self.monitor_thread.start()
+
+    def _send(self, command):
+        self.command = command
+        self.block.send_command(command)
+        self.command_seq += 1
+        self.wake_event.set()
+
+    def _published(self):
+        return self.block.read_published()
+
+    def _monitor_loop(self):
+        while not self.closed:
+            time.sleep(MONITOR_INTERVAL)
+            if self.closed:
+                return
+            status = self._published()["status"]
+            if status.get("status_count", 0) != self.status_count:
+                self.status_count = status.get("status_count", 0)
+                if self.status_callback and status.get("status"):
+                    self.status_callback(status["status"])
+
+    @property
+    def clicking(self):
+        published = self._published()
+        return self.command == COMMAND_RUN and (published["ack_seq"] != self.command_seq or bool(published["running"]))
+
+    @property
+    def click_count(self):
+        return self._published()["click_count"]
+
+    @property
+    def missed_deadlines(self):
+        return self._published()["missed_deadlines"]
+
+    @property
+    def priority_status(self):
+        return self._published()["status"].get("priority_status")
+
+    def get_sequence_clicks(self):
+        return self._published()["status"].get("sequence_clicks")
+
+    def get_controller_state(self):
+        return self._published()["status"].get("controller")
+
+    def get_timing_stats(self):
+        """Return the timing stats last published by the engine process"""
+        return self._published()["stats"]
+
+    def calibrate(self, samples=50):
+        """Measure sleep overshoot on this host, persist it and send it to the engine process"""
+        try:
+            calibration = calibrate_sleep(samples=samples)
+        except Exception as e:
+            print(f"Error calibrating timer: {e}")
+            return None
+
+        self.settings["timing_calibration"] = calibration
+        if self.save_callback:
+            self.save_callback(self.settings)
+        self.update_settings()
+        return calibration
+
+    def get_calibration(self):
+        return self.settings.get("timing_calibration")
+
+    def update_settings(self, settings=None):
+        """Send the current settings to the engine process"""
+        if settings is not None:
+            self.settings = settings
+        if self.block.write_settings(self.settings):
+            self.wake_event.set()
+
+    def start_clicking(self):
+        if not self.clicking:
+            self.update_settings()
+            self._send(COMMAND_RUN)
+            return True
+        return False
+
+    def stop_clicking(self):
+        if self.clicking:
+            self._send(COMMAND_STOP)
+            deadline = time.perf_counter() + STOP_TIMEOUT
+            while time.perf_counter() < deadline:
+                published = self._published()
+                if published["ack_seq"] == self.command_seq and not published["running"]:
+                    return True
+                time.sleep(0.0005)
+            print("Error stopping engine process: no acknowledgement after 1s")
+            return True
+        return False
+
+    def toggle_clicking(self):
+        if self.clicking:
+            return self.stop_clicking()
+        else:
+            return self.start_clicking()
+
+    def handle_hotkey(self, state=None):
+        if state is None:
+            return self.toggle_clicking()
+        elif state:
+            return self.start_clicking()
+        else:
+            return self.stop_clicking()
+
+    def start_recording(self, file_path):
+        """Start recording mouse and keyboard input to a macro file in this process"""
+        if self.macro_recorder is not None:
+            return False
+        try:
+            recorder = MacroRecorder(file_path)
+            recorder.start()
+            self.macro_recorder = recorder
+            return True
+        except Exception as e:
+            print(f"Error starting macro recording: {e}")
+            return False
+
+    def stop_recording(self):
+        """Stop the macro recording and return the number of recorded events"""
+        recorder = self.macro_recorder
+        if recorder is None:
+            return 0
+        self.macro_recorder = None
+        return recorder.stop()
+
+    def shutdown(self):
+        """Stop clicking, end the engine process and free the shared memory"""
+        if self.closed:
+            return
+        self.stop_clicking()
+        self._send(COMMAND_SHUTDOWN)
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1.0)
+        self.closed = True
+        self.monitor_thread.join(timeout=1.0)
+        self.block.close(unlink=True)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Click scheduler for Aerout SpeedAutoClicker
+Serves any number of click channels from one thread and one deadline heap
+"""
+
+import heapq
+import time
+import threading
+
+from click_backends import EVENT_DOWN, EVENT_UP, MouseEventCache, Point
+from click_jitter import JitterGenerator
+from click_timing import PrecisionTimer
+
+MIN_CHANNEL_INTERVAL_MS = 0.01
+
+
+class ClickChannel:
+    """One independently timed click stream
+
+    Press n of a channel is due at t0 + n * interval_ns and its release
+    press_ns after the press was actually posted; if that would run past
+    the next press, the next press waits for the release. With a jitter
+    generator each interval and press time is scaled by a random factor,
+    and the deviations add up in jitter_offset_ns.
+    Channels never share event objects, so two channels on the same button
+    at different positions cannot move each other's events.
+    """
+
+    __slots__ = (
+        "name", "button", "interval_ns", "press_ns", "click_limit", "position",
+        "skip_late", "click_count", "missed_deadlines", "t0", "n", "pressed",
+        "active", "event_cache", "jitter", "jitter_offset_ns", "pressed_ns", "release_ns"
+    )
+
+    def __init__(self, name, button="left", interval_ms=50.0, duty_cycle=50.0, hold_time=0.0,
+                 click_limit=0, position=None, skip_late=False, jitter=None):
+        """Initialize the channel; position None means click at the cursor"""
+        interval_ms = max(MIN_CHANNEL_INTERVAL_MS, float(interval_ms))
+        if hold_time > 0:
+            press_ms = min(float(hold_time), interval_ms)
+        else:
+            press_ms = interval_ms * max(1.0, min(99.0, float(duty_cycle))) / 100.0
+
+        self.name = name
+        self.button = button
+        self.interval_ns = int(interval_ms * 1_000_000)
+        self.press_ns = int(press_ms * 1_000_000)
+        self.click_limit = int(click_limit)
+        self.position = Point(*position) if position is not None else None
+        self.skip_late = skip_late
+        self.click_count = 0
+        self.missed_deadlines = 0
+        self.t0 = None
+        self.n = 0
+        self.pressed = None
+        self.pressed_ns = 0
+        self.release_ns = 0
+        self.active = True
+        self.event_cache = None
+        self.jitter = jitter
+        self.jitter_offset_ns = 0
+
+    @classmethod
+    def from_settings(cls, name, settings):
+        """Build a channel from a settings-style dict"""
+        position = settings.get("position")
+        return cls(
+            name,
+            button=settings.get("mouse_button", "left"),
+            interval_ms=settings.get("interval_ms", 50.0),
+            duty_cycle=settings.get("duty_cycle", 50.0),
+            hold_time=settings.get("hold_time", 0.0),
+            click_limit=settings.get("click_limit", 0) if settings.get("limit_enabled", False) else 0,
+            position=position,
+            skip_late=settings.get("late_policy", "catch_up") == "skip",
+            jitter=JitterGenerator.from_settings(settings)
+        )
+
+
+class ClickScheduler:
+    """Runs every click channel from a single thread using a deadline heap
+
+    Heap entries are ``(due_ns, kind, sequence, channel)``. Releases sort
+    before presses that are due at the same time, and adding channels never
+    adds threads. Long waits block on a condition so that adding a channel
+    can wake the scheduler early; the final stretch before a deadline goes
+    through the PrecisionTimer.
+    """
+
+    def __init__(self, backend, timer=None, position_source=None, on_click=None, pause_gate=None):
+        """Initialize an empty scheduler"""
+        self.backend = backend
+        self.timer = timer if timer is not None else PrecisionTimer()
+        self.position_source = position_source if position_source is not None else backend.get_mouse_position
+        self.on_click = on_click
+        self.pause_gate = pause_gate
+        self.precise = False
+        self.timing_stats = None
+        self.channels = {}
+        self.history = {}
+        self.heap = []
+        self.sequence = 0
+        self.condition = threading.Condition()
+
+    def _push(self, due_ns, kind, channel):
+        self.sequence += 1
+        heapq.heappush(self.heap, (due_ns, kind, self.sequence, channel))
+        if self.heap[0][3] is channel:
+            self.condition.notify()
+
+    def add_channel(self, channel, start_ns=None):
+        """Add a channel; its first press is due at start_ns (default: now)"""
+        with self.condition:
+            if channel.name in self.channels:
+                self.channels[channel.name].active = False
+            self.heap = [entry for entry in self.heap if entry[3] is not channel or entry[1] == EVENT_UP]
+            heapq.heapify(self.heap)
+            channel.event_cache = MouseEventCache(self.backend)
+            channel.t0 = time.perf_counter_ns() if start_ns is None else start_ns
+            channel.n = 0
+            channel.jitter_offset_ns = 0
+            channel.active = True
+            self.channels[channel.name] = channel
+            self.history[channel.name] = channel
+            self._push(channel.t0, EVENT_DOWN, channel)
+        return channel
+
+    def remove_channel(self, name):
+        """Deactivate a channel and close its jitter; a press in progress is still released"""
+        with self.condition:
+            channel = self.channels.pop(name, None)
+            if channel is not None:
+                channel.active = False
+        if channel is not None and channel.jitter is not None:
+            channel.jitter.close()
+        return channel
+
+    def clear(self):
+        """Remove every channel, close their jitter and forget pending events"""
+        with self.condition:
+            channels = list(self.channels.values()) + list(self.history.values())
+            for channel in channels:
+                channel.active = False
+            self.channels = {}
+            self.history = {}
+            self.heap = []
+        for channel in channels:
+            if channel.jitter is not None:
+                channel.jitter.close()
+
+    def wake(self):
+        """Wake the scheduler thread so it re-checks its stop event"""
+        with self.condition:
+            self.condition.notify_all()
+
+    def rebase(self):
+        """Restart every channel's schedule from now, e.g. after a pause"""
+        with self.condition:
+            now = time.perf_counter_ns()
+            self.heap = [entry for entry in self.heap if entry[1] == EVENT_UP]
+            heapq.heapify(self.heap)
+            for channel in self.channels.values():
+                if channel.active:
+                    channel.t0 = now
+                    channel.n = 0
+                    channel.jitter_offset_ns = 0
+                    self._push(now, EVENT_DOWN, channel)
+
+    def release_all(self):
+        """Post the release of every pressed channel immediately"""
+        with self.condition:
+            pending = [entry for entry in self.heap if entry[1] == EVENT_UP]
+            self.heap = [entry for entry in self.heap if entry[1] != EVENT_UP]
+            heapq.heapify(self.heap)
+        for entry in sorted(pending):
+            self._release(entry[3])
+
+    def _press(self, channel, due_ns):
+        position = channel.position if channel.position is not None else self.position_source()
+        mouse_down, mouse_up = channel.event_cache.get(position, channel.button)
+        self.backend.post(mouse_down)
+        now = time.perf_counter_ns()
+        channel.pressed = mouse_up
+        channel.pressed_ns = now
+        if self.timing_stats is not None:
+            self.timing_stats.record_press(due_ns, now)
+
+        press_ns = channel.press_ns
+        if channel.jitter is not None:
+            interval_factor, press_factor = channel.jitter.next()
+            channel.jitter_offset_ns += int(channel.interval_ns * (interval_factor - 1.0))
+            press_ns = int(press_ns * press_factor)
+
+        release_ns = now + press_ns
+        with self.condition:
+            next_due = channel.t0 + channel.n * channel.interval_ns + channel.jitter_offset_ns
+            if now - next_due >= channel.interval_ns:
+                if channel.skip_late:
+                    skipped = (now - next_due) // channel.interval_ns
+                    channel.missed_deadlines += skipped
+                    channel.n += skipped
+                    next_due = channel.t0 + channel.n * channel.interval_ns + channel.jitter_offset_ns
+                else:
+                    channel.missed_deadlines += 1
+
+            channel.release_ns = release_ns
+            self._push(release_ns, EVENT_UP, channel)
+            if channel.active:
+                self._push(max(next_due, release_ns), EVENT_DOWN, channel)
+
+    def _release(self, channel):
+        mouse_up = channel.pressed
+        if mouse_up is None:
+            return
+        self.backend.post(mouse_up)
+        if self.timing_stats is not None:
+            self.timing_stats.record_release(channel.pressed_ns, time.perf_counter_ns())
+        channel.pressed = None
+        channel.click_count += 1
+        if self.on_click:
+            self.on_click(channel)
+        if channel.click_limit and channel.click_count >= channel.click_limit:
+            self.remove_channel(channel.name)
+
+    def run(self, stop_event):
+        """Serve the heap on the calling thread until stop_event is set or no work is left
+
+        The channels are deactivated when it returns, so only the channels of
+        a live run count as active.
+        """
+        spin_margin = self.timer.spin_threshold_ns + 2_000_000
+        try:
+            while not stop_event.is_set():
+                with self.condition:
+                    if not self.heap:
+                        if not self.channels:
+                            break
+                        self.condition.wait(0.05)
+                        continue
+                    entry = self.heap[0]
+                    remaining = entry[0] - time.perf_counter_ns()
+                    if remaining > spin_margin:
+                        self.condition.wait((remaining - spin_margin) / 1e9)
+                        continue
+
+                due_ns, kind, _, channel = entry
+                if kind == EVENT_DOWN and channel.active and self.pause_gate is not None:
+                    if self.pause_gate(self):
+                        continue
+
+                self.timer.sleep_until(due_ns, precise=self.precise)
+                if stop_event.is_set():
+                    break
+
+                with self.condition:
+                    if not self.heap or self.heap[0] is not entry:
+                        continue
+                    heapq.heappop(self.heap)
+                    press = kind == EVENT_DOWN and channel.active
+                    if press:
+                        channel.n += 1
+                        channel.release_ns = max(due_ns, time.perf_counter_ns()) + channel.press_ns
+
+                if kind == EVENT_UP:
+                    self._release(channel)
+                elif press:
+                    self._press(channel, due_ns)
+        finally:
+            self.release_all()
+            with self.condition:
+                for channel in self.channels.values():
+                    channel.active = False
+
+    def stats(self):
+        """Return click and missed-deadline counts of every channel since the last clear"""
+        with self.condition:
+            channels = list(self.history.values())
+        return {
+            channel.name: {
+                "clicks": channel.click_count,
+                "missed_deadlines": channel.missed_deadlines
+            }
+            for channel in channels
+        }
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Click sequences for Aerout SpeedAutoClicker
+Compiles step lists into flat timelines and plays them back
+"""
+
+import json
+import math
+import time
+from array import array
+
+from click_backends import BUTTON_TYPES, EVENT_DOWN, EVENT_UP, MouseEventCache
+
+LATE_THRESHOLD_NS = 1_000_000
+
+
+def load_sequence(file_path):
+    """Load a sequence file and return (steps, repeat)
+
+    The file is JSON, either a list of steps or an object with "steps" and
+    an optional "repeat". A step looks like
+    {"button": "left", "x": 100, "y": 200, "press_ms": 20, "gap_ms": 80};
+    steps without x/y click wherever the cursor is.
+    """
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data, 1
+    return data.get("steps", []), int(data.get("repeat", 1))
+
+
+class CompiledSequence:
+    """A sequence flattened into parallel arrays, sorted by time
+
+    times holds nanosecond offsets from the start of one pass, codes holds
+    button_index * 2 + direction, and xs/ys hold positions (NaN means the
+    cursor position). Playback only indexes these arrays.
+    """
+
+    def __init__(self, times, codes, xs, ys, duration_ns, repeat=1):
+        """Wrap already compiled arrays"""
+        self.times = times
+        self.codes = codes
+        self.xs = xs
+        self.ys = ys
+        self.duration_ns = duration_ns
+        self.repeat = repeat
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def click_count(self):
+        return len(self.times) // 2 * max(1, self.repeat)
+
+
+def compile_sequence(steps, repeat=1):
+    """Compile a list of step dicts into a CompiledSequence"""
+    events = []
+    offset = 0
+    for step in steps:
+        button = step.get("button", "left")
+        if button not in BUTTON_TYPES:
+            raise ValueError(f"Unknown mouse button in sequence: {button}")
+        button_index = BUTTON_TYPES.index(button)
+        press_ns = int(max(0.0, float(step.get("press_ms", 10.0))) * 1_000_000)
+        gap_ns = int(max(0.0, float(step.get("gap_ms", 90.0))) * 1_000_000)
+        x = float(step["x"]) if step.get("x") is not None else math.nan
+        y = float(step["y"]) if step.get("y") is not None else math.nan
+
+        events.append((offset, button_index * 2 + EVENT_DOWN, x, y))
+        events.append((offset + press_ns, button_index * 2 + EVENT_UP, x, y))
+        offset += press_ns + gap_ns
+
+    # Steps follow one another, so the events are already in time order and
+    # each down comes before its own up, even when press_ms is 0
+    return CompiledSequence(
+        array('q', (event[0] for event in events)),
+        array('b', (event[1] for event in events)),
+        array('d', (event[2] for event in events)),
+        array('d', (event[3] for event in events)),
+        offset,
+        max(1, int(repeat))
+    )
+
+
+class SequencePlayer:
+    """Plays a CompiledSequence with absolute deadlines
+
+    Event i of pass k is due at t0 + k * duration_ns + times[i]. Late events
+    are posted immediately, and those more than LATE_THRESHOLD_NS late are
+    counted in missed_deadlines, so the sequence never drifts.
+    """
+
+    def __init__(self, backend, timer, position_source=None, on_click=None, pause_gate=None):
+        """Initialize the player for a backend and PrecisionTimer"""
+        self.backend = backend
+        self.timer = timer
+        self.position_source = position_source if position_source is not None else backend.get_mouse_position
+        self.on_click = on_click
+        self.pause_gate = pause_gate
+        self.caches = {button: MouseEventCache(backend) for button in BUTTON_TYPES}
+        self.pressed = {}
+        self.pressed_ns = {}
+        self.timing_stats = None
+        self.missed_deadlines = 0
+        self.click_count = 0
+
+    def release_all(self):
+        """Release every button the sequence is currently holding"""
+        for mouse_up in list(self.pressed.values()):
+            self.backend.post(mouse_up)
+        self.pressed = {}
+        self.pressed_ns = {}
+
+    def play(self, sequence, stop_event, precise=False, click_limit=0):
+        """Play the sequence on the calling thread and return the number of clicks"""
+        times = sequence.times
+        codes = sequence.codes
+        xs = sequence.xs
+        ys = sequence.ys
+        count = len(times)
+        post = self.backend.post
+        sleep_until = self.timer.sleep_until
+        pause_gate = self.pause_gate
+        timing_stats = self.timing_stats
+        self.missed_deadlines = 0
+        self.click_count = 0
+
+        t0 = time.perf_counter_ns()
+        try:
+            for _ in range(sequence.repeat):
+                index = 0
+                while index < count:
+                    if stop_event.is_set():
+                        return self.click_count
+                    code = codes[index]
+                    is_down = code & 1 == EVENT_DOWN
+
+                    if is_down and pause_gate is not None and pause_gate(self):
+                        t0 = time.perf_counter_ns() - times[index]
+                        continue
+
+                    deadline = t0 + times[index]
+                    woke = sleep_until(deadline, precise=precise)
+                    if woke - deadline > LATE_THRESHOLD_NS:
+                        self.missed_deadlines += 1
+                    if stop_event.is_set():
+                        return self.click_count
+
+                    button = BUTTON_TYPES[code >> 1]
+                    if is_down:
+                        x = xs[index]
+                        if x != x:
+                            mouse_down, mouse_up = self.caches[button].get(self.position_source(), button)
+                        else:
+                            mouse_down, mouse_up = self.caches[button].get_at(x, ys[index], button)
+                        post(mouse_down)
+                        self.pressed[button] = mouse_up
+                        if timing_stats is not None:
+                            now = time.perf_counter_ns()
+                            self.pressed_ns[button] = now
+                            timing_stats.record_press(deadline, now)
+                    else:
+                        mouse_up = self.pressed.pop(button, None)
+                        if mouse_up is not None:
+                            post(mouse_up)
+                            if timing_stats is not None:
+                                timing_stats.record_release(self.pressed_ns.get(button, woke), time.perf_counter_ns())
+                            self.click_count += 1
+                            if self.on_click:
+                                self.on_click(self)
+                            if click_limit and self.click_count >= click_limit:
+                                return self.click_count
+                    index += 1
+                t0 += sequence.duration_ns
+        finally:
+            self.release_all()
+        return self.click_count
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Click timing statistics for Aerout SpeedAutoClicker
+Fixed-memory histograms of click lateness and hold time
+"""
+
+import time
+from array import array
+
+DEFAULT_SUB_BUCKET_BITS = 7
+DEFAULT_MAX_VALUE_NS = 60_000_000_000
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of nanosecond values in fixed memory
+
+    Values below 2**sub_bucket_bits get a bucket each. Above that, every
+    power of two is split into 2**(sub_bucket_bits - 1) linear buckets, so
+    the relative error stays below 2**(1 - sub_bucket_bits) (under 1.6% by
+    default) for every value up to max_value_ns. Larger values are clamped
+    into the last bucket; max is always kept exactly.
+    """
+
+    def __init__(self, max_value_ns=DEFAULT_MAX_VALUE_NS, sub_bucket_bits=DEFAULT_SUB_BUCKET_BITS):
+        """Allocate the buckets for values up to max_value_ns"""
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_value_ns = int(max_value_ns)
+        self.bucket_count = self._index(self.max_value_ns) + 1
+        self.reset()
+
+    def reset(self):
+        """Forget every recorded value"""
+        self.counts = array('Q', bytes(8 * self.bucket_count))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (value >> shift) - self.half_count
+
+    def _value(self, index):
+        """Return the midpoint of a bucket"""
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        top = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return (top << shift) + (1 << (shift - 1))
+
+    def record(self, value):
+        """Add one value; negative values count as zero"""
+        value = int(value)
+        if value < 0:
+            value = 0
+        self.counts[self._index(min(value, self.max_value_ns))] += 1
+        self.count += 1
+        self.total += value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentile(self, percent):
+        """Return the value at the given percentile, or 0 when empty"""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class ClickTimingStats:
+    """Per-click timing of one clicking run
+
+    Presses record how late they were posted compared to their scheduled
+    time, and releases record how long the button was held down. Recording
+    only touches two histograms, so it is cheap enough for every click.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics"""
+        self.lateness = LatencyHistogram()
+        self.hold = LatencyHistogram()
+        self.reset()
+
+    def reset(self, start_ns=None):
+        """Start a new run that was requested at start_ns"""
+        self.start_ns = start_ns
+        self.lateness.reset()
+        self.hold.reset()
+        self.clicks = 0
+        self.cpu_ns = 0
+        self.first_press_ns = None
+        self.last_press_ns = None
+
+    def record_press(self, scheduled_ns, actual_ns):
+        """Record a mouse-down posted at actual_ns that was due at scheduled_ns"""
+        self.lateness.record(actual_ns - scheduled_ns)
+        if self.first_press_ns is None:
+            self.first_press_ns = actual_ns
+        self.last_press_ns = actual_ns
+
+    def record_release(self, down_ns, up_ns):
+        """Record a completed click that was held from down_ns to up_ns"""
+        self.hold.record(up_ns - down_ns)
+        self.clicks += 1
+
+    def start_latency_ns(self):
+        """Return the time from the start request to the first posted press, or None"""
+        if self.start_ns is None or self.first_press_ns is None:
+            return None
+        return self.first_press_ns - self.start_ns
+
+    def achieved_cps(self):
+        """Return presses per second between the first and the last press"""
+        if self.first_press_ns is None or self.lateness.count < 2:
+            return 0.0
+        span_ns = self.last_press_ns - self.first_press_ns
+        return (self.lateness.count - 1) * 1e9 / span_ns if span_ns > 0 else 0.0
+
+    def summary(self):
+        """Return the statistics as a plain dict in microseconds"""
+        lateness = self.lateness
+        hold = self.hold
+        start_latency = self.start_latency_ns()
+        return {
+            "clicks": self.clicks,
+            "start_latency_us": start_latency / 1000.0 if start_latency is not None else 0.0,
+            "achieved_cps": self.achieved_cps(),
+            "lateness_p50_us": lateness.percentile(50) / 1000.0,
+            "lateness_p99_us": lateness.percentile(99) / 1000.0,
+            "lateness_max_us": (lateness.max or 0) / 1000.0,
+            "lateness_mean_us": lateness.mean() / 1000.0,
+            "hold_p50_us": hold.percentile(50) / 1000.0,
+            "hold_p99_us": hold.percentile(99) / 1000.0,
+            "hold_max_us": (hold.max or 0) / 1000.0,
+            "cpu_us_per_click": self.cpu_ns / self.clicks / 1000.0 if self.clicks else 0.0,
+            "timestamp": time.time()
+        }
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Timing helpers for Aerout SpeedAutoClicker
+High precision waits for the click engine
+"""
+
+import time
+import platform
+import threading
+from datetime import datetime
+
+
+class PrecisionTimer:
+    """Waits for a perf_counter_ns deadline with a coarse sleep and a final spin
+
+    time.sleep alone overshoots by up to a few milliseconds, so the last
+    spin_threshold_ns before a deadline are busy-waited instead. Spinning
+    burns a core, so the share of wall time spent spinning is checked once
+    per budget window; if it went over cpu_budget the next window falls back
+    to plain sleeps. Every sleep is shortened by sleep_bias_ns, the typical
+    overshoot measured by calibrate_sleep.
+
+    With an interrupt event, sleeps wait on that event and the spin checks
+    it, so setting it ends any wait at once.
+    """
+
+    def __init__(self, spin_threshold_ns=2_000_000, cpu_budget=0.5, window_ns=1_000_000_000, interrupt=None):
+        """Initialize the timer"""
+        self.interrupt = interrupt
+        self.spin_threshold_ns = spin_threshold_ns
+        self.cpu_budget = cpu_budget
+        self.window_ns = window_ns
+        self.window_start = time.perf_counter_ns()
+        self.window_spin_ns = 0
+        self.total_spin_ns = 0
+        self.throttled = False
+        self.sleep_bias_ns = 0
+
+    def configure(self, spin_threshold_ns=None, cpu_budget=None, sleep_bias_ns=None):
+        """Change the spin threshold, CPU budget or measured sleep bias"""
+        if sleep_bias_ns is not None:
+            self.sleep_bias_ns = max(0, int(sleep_bias_ns))
+        if spin_threshold_ns is not None:
+            self.spin_threshold_ns = max(0, int(spin_threshold_ns))
+        if cpu_budget is not None:
+            self.cpu_budget = max(0.0, min(1.0, float(cpu_budget)))
+
+    def _over_budget(self, now):
+        elapsed = now - self.window_start
+        if elapsed >= self.window_ns:
+            self.throttled = self.window_spin_ns > self.cpu_budget * elapsed
+            self.window_start = now
+            self.window_spin_ns = 0
+        return self.throttled
+
+    def _sleep(self, seconds):
+        if self.interrupt is None:
+            time.sleep(seconds)
+            return False
+        return self.interrupt.wait(seconds)
+
+    def sleep_until(self, deadline_ns, precise=True):
+        """Block until deadline_ns (or the interrupt) and return the perf_counter_ns wake time"""
+        now = time.perf_counter_ns()
+        remaining = deadline_ns - now
+        if remaining <= 0:
+            return now
+
+        if not precise or self._over_budget(now):
+            coarse = remaining - self.sleep_bias_ns
+            if coarse > 0:
+                self._sleep(coarse / 1e9)
+            return time.perf_counter_ns()
+
+        coarse = remaining - self.spin_threshold_ns - self.sleep_bias_ns
+        if coarse > 0 and self._sleep(coarse / 1e9):
+            return time.perf_counter_ns()
+
+        spin_start = time.perf_counter_ns()
+        now = spin_start
+        if self.interrupt is None:
+            while now < deadline_ns:
+                now = time.perf_counter_ns()
+        else:
+            interrupted = self.interrupt.is_set
+            while now < deadline_ns and not interrupted():
+                now = time.perf_counter_ns()
+        spun = now - spin_start
+        self.window_spin_ns += spun
+        self.total_spin_ns += spun
+        return now
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def calibrate_sleep(samples=50, request_ns=1_000_000):
+    """Measure how far a short interruptible wait overshoots on this host
+
+    The wait is Event.wait, the same call PrecisionTimer makes when it has
+    an interrupt event, since its overshoot differs from time.sleep.
+    Returns a plain dict (so it can be stored in the settings file) with
+    the overshoot distribution in microseconds and the bias in nanoseconds
+    that PrecisionTimer should subtract from each sleep.
+    """
+    overshoots = []
+    wait = threading.Event().wait
+    for _ in range(samples):
+        start = time.perf_counter_ns()
+        wait(request_ns / 1e9)
+        overshoots.append(max(0, time.perf_counter_ns() - start - request_ns))
+    overshoots.sort()
+
+    return {
+        "samples": samples,
+        "request_us": request_ns / 1000.0,
+        "mean_us": sum(overshoots) / len(overshoots) / 1000.0,
+        "median_us": _percentile(overshoots, 0.5) / 1000.0,
+        "p90_us": _percentile(overshoots, 0.9) / 1000.0,
+        "p99_us": _percentile(overshoots, 0.99) / 1000.0,
+        "max_us": overshoots[-1] / 1000.0,
+        "bias_ns": _percentile(overshoots, 0.5),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds")
+    }
@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+Click engine for Aerout SpeedAutoClicker
+Runs the click loop on top of a pluggable event backend
+"""
+
+import os
+import time
+import threading
+
+from click_backends import MouseEventCache, Point, create_default_backend
+from click_jitter import JitterGenerator
+from click_timing import PrecisionTimer, calibrate_sleep
+from cps_controller import CPSController
+from click_scheduler import ClickChannel, ClickScheduler
+from click_stats import ClickTimingStats
+from click_sequence import SequencePlayer, compile_sequence, load_sequence
+from cursor_tracking import CursorSampler, MovementDetector
+from thread_priority import apply_thread_priority, restore_thread_priority, save_thread_priority
+from macro_recorder import MacroPlayer, MacroRecorder
+
+MIN_INTERVAL_MS = 1.0
+MIN_PRECISE_INTERVAL_MS = 0.01
+PRIMARY_CHANNEL = "primary"
+
+
+class ClickPlan:
+    """Immutable snapshot of the click settings, compiled for the hot loop
+
+    All clamping and unit conversion happens once in from_settings. The
+    engine swaps in a new plan whenever a setting changes, so the click loop
+    only ever sees a complete configuration and never touches the settings
+    dict while clicking.
+    """
+
+    __slots__ = (
+        "button", "interval_ns", "press_ns", "release_ns", "relative_cycle_ns",
+        "click_limit", "pause_on_movement", "deadline", "skip_late", "precise",
+        "spin_threshold_ns", "spin_cpu_budget", "fixed_position", "cursor_sample_hz",
+        "channels", "sequence_enabled", "macro_enabled", "high_priority",
+        "thread_priority", "cpu_affinity"
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ClickPlan is immutable")
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Compile a settings dict into a plan"""
+        precise = settings.get("timing_mode", "sleep") == "precise"
+        min_interval_ms = MIN_PRECISE_INTERVAL_MS if precise else MIN_INTERVAL_MS
+        interval_ms = max(min_interval_ms, float(settings.get("interval_ms", 50.0)))
+        hold_time = float(settings.get("hold_time", 0.0))
+
+        if hold_time > 0:
+            press_ms = hold_time
+            relative_cycle_ms = interval_ms - hold_time
+        else:
+            duty_cycle = max(1.0, min(99.0, float(settings.get("duty_cycle", 50.0))))
+            press_ms = (interval_ms * duty_cycle) / 100.0
+            relative_cycle_ms = interval_ms
+
+        interval_ns = int(interval_ms * 1_000_000)
+        press_ns = int(press_ms * 1_000_000)
+
+        fixed_position = None
+        if settings.get("fixed_point_enabled", False):
+            fixed_point = settings.get("fixed_point", [0, 0])
+            fixed_position = Point(float(fixed_point[0]), float(fixed_point[1]))
+
+        return cls(
+            button=settings.get("mouse_button", "left"),
+            interval_ns=interval_ns,
+            press_ns=press_ns,
+            release_ns=max(0, interval_ns - press_ns),
+            relative_cycle_ns=int(relative_cycle_ms * 1_000_000),
+            click_limit=int(settings.get("click_limit", 0)) if settings.get("limit_enabled", False) else 0,
+            pause_on_movement=bool(settings.get("pause_on_movement", True)),
+            deadline=settings.get("schedule_mode", "deadline") == "deadline",
+            skip_late=settings.get("late_policy", "catch_up") == "skip",
+            precise=precise,
+            spin_threshold_ns=int(float(settings.get("spin_threshold_us", 2000.0)) * 1000),
+            spin_cpu_budget=float(settings.get("spin_cpu_budget", 0.5)),
+            fixed_position=fixed_position,
+            cursor_sample_hz=float(settings.get("cursor_sample_hz", 250.0)),
+            channels=tuple(dict(channel) for channel in settings.get("channels", [])),
+            sequence_enabled=bool(settings.get("sequence_enabled", False)),
+            macro_enabled=bool(settings.get("macro_playback_enabled", False)) and bool(settings.get("macro_file")),
+            high_priority=bool(settings.get("high_priority", False)),
+            thread_priority=int(settings.get("thread_priority", 10)),
+            cpu_affinity=tuple(settings.get("cpu_affinity", []))
+        )
+
+
+class AdvancedClickerEngine:
+    def __init__(self, settings, status_callback=None, backend=None, save_callback=None):
+        self.settings = settings
+        self.status_callback = status_callback
+        self.save_callback = save_callback
+        self.backend = backend if backend is not None else create_default_backend()
+        self.event_cache = MouseEventCache(self.backend)
+        self.clicking = False
+        self.click_thread = None
+        self.worker_condition = threading.Condition()
+        self.run_requested = False
+        self.shutting_down = False
+        self.idle_event = threading.Event()
+        self.idle_event.set()
+        self.start_requested_ns = None
+        self.stop_event = threading.Event()
+        self.click_count = 0
+        self.missed_deadlines = 0
+        self.last_mouse_position = (0, 0)
+        self.movement_detected = False
+        self.last_resume_latency_ns = None
+        self.priority_status = None
+        self.cps_controller = None
+        self.timing_stats = ClickTimingStats()
+        self.timer = PrecisionTimer(interrupt=self.stop_event)
+        self.movement_detector = MovementDetector()
+        self.sampler = CursorSampler(self.backend, detector=self.movement_detector)
+        self.scheduler = ClickScheduler(
+            self.backend,
+            timer=self.timer,
+            position_source=self.get_mouse_position,
+            on_click=self._on_channel_click,
+            pause_gate=self._channel_pause_gate
+        )
+        self.sequence = None
+        self.sequence_source = None
+        self.sequence_player = SequencePlayer(
+            self.backend,
+            self.timer,
+            position_source=self.get_mouse_position,
+            on_click=self._on_channel_click,
+            pause_gate=self._sequence_pause_gate
+        )
+        self.macro_player = MacroPlayer(self.backend, self.timer)
+        self.scheduler.timing_stats = self.timing_stats
+        self.sequence_player.timing_stats = self.timing_stats
+        self.macro_player.timing_stats = self.timing_stats
+        self.macro_recorder = None
+        self.plan = None
+        self.update_settings()
+
+        if self.settings.get("auto_calibrate", True):
+            self.calibrate()
+        else:
+            self.apply_calibration(self.settings.get("timing_calibration"))
+
+        self.click_thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.click_thread.start()
+
+    def calibrate(self, samples=50):
+        """Measure sleep overshoot on this host, apply it and persist it"""
+        try:
+            calibration = calibrate_sleep(samples=samples)
+        except Exception as e:
+            print(f"Error calibrating timer: {e}")
+            return None
+
+        self.settings["timing_calibration"] = calibration
+        self.apply_calibration(calibration)
+        if self.save_callback:
+            self.save_callback(self.settings)
+        return calibration
+
+    def get_calibration(self):
+        return self.settings.get("timing_calibration")
+
+    def apply_calibration(self, calibration):
+        """Use a calibration from calibrate_sleep() without measuring again"""
+        if calibration:
+            self.timer.configure(sleep_bias_ns=calibration.get("bias_ns", 0))
+
+    def get_mouse_position(self):
+        """Return the click position without querying the OS on the click path
+
+        A pinned fixed point is returned as is; otherwise the newest sample
+        published by the cursor sampler thread is used.
+        """
+        fixed_position = self.plan.fixed_position
+        if fixed_position is not None:
+            self.movement_detected = False
+            return fixed_position
+
+        sample = self.sampler.latest
+        if sample is None:
+            sample = self.sampler.sample()
+        position = sample[0]
+        self.movement_detected = sample[1]
+        self.last_mouse_position = (position.x, position.y)
+        return position
+
+    def update_settings(self, settings=None):
+        """Recompile the click plan after the settings changed
+
+        The new plan replaces the old one in a single attribute assignment,
+        so a running click loop picks it up on its next click.
+        """
+        if settings is not None:
+            self.settings = settings
+        plan = ClickPlan.from_settings(self.settings)
+        self.timer.configure(
+            spin_threshold_ns=plan.spin_threshold_ns,
+            cpu_budget=plan.spin_cpu_budget
+        )
+        self.sampler.rate_hz = plan.cursor_sample_hz
+        self.movement_detector.configure(
+            distance_threshold=self.settings.get("movement_threshold_px", 5.0),
+            velocity_threshold=self.settings.get("movement_velocity_threshold", 300.0),
+            hysteresis=self.settings.get("movement_hysteresis", 0.5),
+            resume_delay_ms=self.settings.get("movement_resume_ms", 150.0)
+        )
+        if plan.sequence_enabled:
+            self._load_sequence_file(self.settings.get("sequence_file", ""))
+
+        previous = self.plan
+        self.plan = plan
+        if (self.clicking and previous is not None and plan.deadline and
+                not plan.channels and not previous.channels):
+            self.scheduler.precise = plan.precise
+            self._replace_primary_channel(plan)
+        return plan
+
+    def set_sequence(self, steps, repeat=1):
+        """Compile a list of sequence steps and use it for sequence playback"""
+        self.sequence = compile_sequence(steps, repeat)
+        self.sequence_source = None
+        return self.sequence
+
+    def _load_sequence_file(self, file_path):
+        if not file_path:
+            return
+        try:
+            source = (file_path, os.path.getmtime(file_path))
+            if source == self.sequence_source:
+                return
+            steps, repeat = load_sequence(file_path)
+            self.sequence = compile_sequence(steps, repeat)
+            self.sequence_source = source
+        except Exception as e:
+            print(f"Error loading click sequence: {e}")
+            self.sequence = None
+            self.sequence_source = None
+
+    def get_sequence_clicks(self):
+        """Return the number of clicks in the loaded sequence, or None"""
+        return self.sequence.click_count if self.sequence is not None else None
+
+    def start_recording(self, file_path):
+        """Start recording mouse and keyboard input to a macro file"""
+        if self.macro_recorder is not None:
+            return False
+        try:
+            recorder = MacroRecorder(file_path)
+            recorder.start()
+            self.macro_recorder = recorder
+            return True
+        except Exception as e:
+            print(f"Error starting macro recording: {e}")
+            return False
+
+    def stop_recording(self):
+        """Stop the macro recording and return the number of recorded events"""
+        recorder = self.macro_recorder
+        if recorder is None:
+            return 0
+        self.macro_recorder = None
+        return recorder.stop()
+
+    def get_controller_state(self):
+        """Return the CPS controller's target, measured CPS, error and correction, or None"""
+        controller = self.cps_controller
+        return controller.state() if controller is not None else None
+
+    def get_timing_stats(self):
+        """Return lateness percentiles, hold times and achieved CPS of the current or last run"""
+        return self.timing_stats.summary()
+
+    def wait_until(self, deadline_ns):
+        return self.timer.sleep_until(deadline_ns, precise=self.plan.precise)
+
+    def perform_click(self, position, button_type=None, plan=None, press_ns=None, due_ns=None):
+        try:
+            if plan is None:
+                plan = self.plan
+            if button_type is None:
+                button_type = plan.button
+            if press_ns is None:
+                press_ns = plan.press_ns
+
+            mouse_down, mouse_up = self.event_cache.get(position, button_type)
+            self.backend.post(mouse_down)
+            down_ns = time.perf_counter_ns()
+            try:
+                self.wait_until(down_ns + press_ns)
+            finally:
+                self.backend.post(mouse_up)
+            if due_ns is not None:
+                self.timing_stats.record_press(due_ns, down_ns)
+                self.timing_stats.record_release(down_ns, time.perf_counter_ns())
+
+            return True
+        except Exception as e:
+            print(f"Error performing click: {e}")
+            return False
+
+    def clicking_loop(self):
+        try:
+            self.click_count = 0
+            self.missed_deadlines = 0
+            self.timing_stats.reset(self.start_requested_ns)
+            saved_priority = None
+            if self.plan.high_priority:
+                saved_priority = save_thread_priority()
+                self.priority_status = apply_thread_priority(self.plan.thread_priority, self.plan.cpu_affinity)
+            else:
+                self.priority_status = None
+            cpu_start = time.thread_time_ns()
+
+            self.movement_detected = False
+            self.movement_detector.reset()
+            if self.plan.fixed_position is None and not self.plan.macro_enabled:
+                self.sampler.start()
+
+            if self.status_callback:
+                self.status_callback("Running")
+
+            try:
+                if self.plan.macro_enabled:
+                    self._macro_loop()
+                elif self.plan.sequence_enabled and self.sequence is not None:
+                    self._sequence_loop()
+                elif self.plan.channels or self.plan.deadline:
+                    self._channel_loop()
+                else:
+                    self._relative_loop()
+            finally:
+                self.sampler.stop()
+                self.timing_stats.cpu_ns = time.thread_time_ns() - cpu_start
+                if saved_priority is not None:
+                    restore_thread_priority(saved_priority)
+
+            if self.status_callback:
+                click_limit = self.plan.click_limit
+                if click_limit and self.click_count >= click_limit:
+                    self.status_callback(f"Completed {self.click_count} clicks")
+                else:
+                    self.status_callback("Stopped")
+
+            self.clicking = False
+        except Exception as e:
+            print(f"Error in clicking loop: {e}")
+            if self.status_callback:
+                self.status_callback(f"Error: {str(e)}")
+            self.clicking = False
+
+    def _relative_loop(self):
+        jitter = JitterGenerator.from_settings(self.settings)
+        try:
+            self._run_relative(jitter)
+        finally:
+            if jitter is not None:
+                jitter.close()
+
+    def _run_relative(self, jitter):
+        """Click with waits measured from each click's start
+
+        With the CPS controller enabled, each wait starts from the full
+        interval and is trimmed by the controller's correction, so the
+        measured rate converges on the target whatever the per-click
+        overhead is.
+        """
+        controller = CPSController.from_settings(self.settings, self.plan.interval_ns)
+        self.cps_controller = controller
+        due_ns = time.perf_counter_ns()
+        while not self.stop_event.is_set():
+            plan = self.plan
+
+            if plan.pause_on_movement and self.movement_detector.moving:
+                self._wait_for_resume()
+                due_ns = time.perf_counter_ns()
+                if controller is not None:
+                    controller.reset()
+                continue
+
+            start_time = time.perf_counter_ns()
+            if controller is not None:
+                if controller.target_period_ns != plan.interval_ns:
+                    controller.set_target(plan.interval_ns)
+                cycle_ns = plan.interval_ns
+            else:
+                cycle_ns = plan.relative_cycle_ns
+            press_ns = plan.press_ns
+            if jitter is not None:
+                interval_factor, press_factor = jitter.next()
+                cycle_ns = int(cycle_ns * interval_factor)
+                press_ns = int(press_ns * press_factor)
+
+            position = self.get_mouse_position()
+            success = self.perform_click(position, plan.button, plan, press_ns, due_ns)
+
+            if success:
+                self.click_count += 1
+                if plan.click_limit and self.click_count >= plan.click_limit:
+                    break
+                if controller is not None:
+                    cycle_ns = max(0, cycle_ns + int(controller.update(start_time)))
+
+            due_ns = start_time + cycle_ns
+            if cycle_ns > 0 and not self.stop_event.is_set():
+                self.wait_until(due_ns)
+
+    def _primary_channel(self, plan):
+        channel = ClickChannel(
+            PRIMARY_CHANNEL,
+            button=plan.button,
+            click_limit=plan.click_limit,
+            position=plan.fixed_position,
+            skip_late=plan.skip_late,
+            jitter=JitterGenerator.from_settings(self.settings)
+        )
+        channel.interval_ns = plan.interval_ns
+        channel.press_ns = min(plan.press_ns, plan.interval_ns)
+        return channel
+
+    def _channel_loop(self):
+        """Run the clicks on this thread through the deadline scheduler
+
+        Press n is due at t0 + n * interval and its release press_ns later,
+        both on the same heap, so the thread never sleeps through a press and
+        sleep overshoot never accumulates. When a deadline has already passed,
+        the "catch_up" policy fires the late clicks back to back until the
+        schedule is met again, while "skip" drops the missed slots. Either way
+        they are counted in missed_deadlines.
+
+        Without configured channels the main settings run as the single
+        primary channel. The plan is read under the scheduler lock, so a
+        settings change lands either here or in _replace_primary_channel.
+        """
+        self.scheduler.clear()
+        with self.scheduler.condition:
+            plan = self.plan
+            self.scheduler.precise = plan.precise
+            start_ns = time.perf_counter_ns()
+            if plan.channels:
+                for index, channel_settings in enumerate(plan.channels):
+                    name = channel_settings.get("name", f"channel {index + 1}")
+                    self.scheduler.add_channel(ClickChannel.from_settings(name, channel_settings), start_ns)
+            else:
+                self.scheduler.add_channel(self._primary_channel(plan), start_ns)
+        self.scheduler.run(self.stop_event)
+        self.missed_deadlines = sum(stats["missed_deadlines"] for stats in self.scheduler.stats().values())
+        for channel in self.scheduler.history.values():
+            if channel.jitter is not None:
+                channel.jitter.close()
+
+    def _replace_primary_channel(self, plan):
+        """Carry a running primary channel over to a new plan without a gap
+
+        The click thread claims a press index under the scheduler lock
+        before posting it, so reading the old channel's progress and
+        swapping in the new one under that lock neither repeats nor drops
+        a click. The new channel's first press also waits for the old
+        channel's pending release.
+        """
+        scheduler = self.scheduler
+        old = scheduler.channels.get(PRIMARY_CHANNEL)
+        if old is None or not old.active:
+            return
+        channel = self._primary_channel(plan)
+        with scheduler.condition:
+            old = scheduler.channels.get(PRIMARY_CHANNEL)
+            if old is not None and old.active:
+                channel.click_count = old.click_count
+                channel.missed_deadlines = old.missed_deadlines
+                start_ns = old.t0 + old.n * old.interval_ns + old.jitter_offset_ns
+                scheduler.add_channel(channel, max(start_ns, old.release_ns))
+            else:
+                old = None
+        if old is None:
+            if channel.jitter is not None:
+                channel.jitter.close()
+        elif old.jitter is not None:
+            old.jitter.close()
+
+    def _sequence_loop(self):
+        """Play the compiled click sequence instead of the fixed-interval clicks"""
+        plan = self.plan
+        self.sequence_player.play(
+            self.sequence,
+            self.stop_event,
+            precise=plan.precise,
+            click_limit=plan.click_limit
+        )
+        self.missed_deadlines = self.sequence_player.missed_deadlines
+
+    def _macro_loop(self):
+        """Replay the recorded macro file at its original timing"""
+        self.macro_player.play(
+            self.settings.get("macro_file", ""),
+            self.stop_event,
+            precise=self.plan.precise,
+            on_click=self._on_channel_click
+        )
+
+    def _sequence_pause_gate(self, player):
+        if not (self.plan.pause_on_movement and self.movement_detector.moving):
+            return False
+        player.release_all()
+        self._wait_for_resume()
+        return True
+
+    def _on_channel_click(self, channel):
+        self.click_count += 1
+
+    def _channel_pause_gate(self, scheduler):
+        if not (self.plan.pause_on_movement and self.movement_detector.moving):
+            return False
+        scheduler.release_all()
+        self._wait_for_resume()
+        scheduler.rebase()
+        return True
+
+    def _wait_for_resume(self):
+        """Park the click thread until the movement detector reports still"""
+        self.movement_detected = True
+        if self.status_callback:
+            self.status_callback("Paused (mouse moving)")
+
+        self.movement_detector.wait_until_still(self.stop_event)
+        if self.stop_event.is_set():
+            return
+
+        resume_due = self.movement_detector.resume_due_ns
+        if resume_due is not None:
+            self.last_resume_latency_ns = time.perf_counter_ns() - resume_due
+        self.movement_detected = False
+        if self.status_callback:
+            self.status_callback("Running")
+
+    def _worker_loop(self):
+        """Run the long-lived click thread, parked on a condition between runs
+
+        Starting to click only notifies this thread, so the first click does
+        not wait for a new thread to be created and scheduled.
+        """
+        while True:
+            with self.worker_condition:
+                while not self.run_requested and not self.shutting_down:
+                    self.worker_condition.wait()
+                if self.shutting_down:
+                    return
+                self.run_requested = False
+
+            self.clicking_loop()
+
+            with self.worker_condition:
+                if not self.run_requested:
+                    self.idle_event.set()
+
+    def start_clicking(self):
+        if not self.clicking:
+            self.clicking = True
+            self.update_settings()
+            self.stop_event.clear()
+            with self.worker_condition:
+                self.idle_event.clear()
+                self.start_requested_ns = time.perf_counter_ns()
+                self.run_requested = True
+                self.worker_condition.notify()
+            return True
+        return False
+
+    def stop_clicking(self):
+        if self.clicking:
+            self.stop_event.set()
+            self.movement_detector.wake()
+            self.scheduler.wake()
+            if not self.idle_event.wait(timeout=1.0):
+                print("Error stopping click thread: still running after 1s")
+            self.clicking = False
+            return True
+        return False
+
+    def shutdown(self):
+        """Stop clicking and end the click and cursor sampler threads"""
+        self.stop_clicking()
+        with self.worker_condition:
+            self.shutting_down = True
+            self.worker_condition.notify()
+        self.sampler.close()
+        if self.click_thread.is_alive():
+            self.click_thread.join(timeout=1.0)
+
+    def toggle_clicking(self):
+        if self.clicking:
+            return self.stop_clicking()
+        else:
+            return self.start_clicking()
+
+    def handle_hotkey(self, state=None):
+        if state is None:
+            return self.toggle_clicking()
+        elif state:
+            return self.start_clicking()
+        else:
+            return self.stop_clicking()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CPS controller for Aerout SpeedAutoClicker
+Closed-loop correction of the click wait to hold the target rate
+"""
+
+from collections import deque
+
+
+class CPSController:
+    """PI controller that trims the wait between clicks to hold a target period
+
+    The measured period is the mean press-to-press time over the last
+    window clicks. The error (measured minus target, in nanoseconds) feeds a
+    proportional and an integral term, and their sum is subtracted from the
+    nominal wait. The correction is clamped to +-max_fraction of the target
+    period, and the integral only accumulates while the output is not
+    clamped, so it cannot wind up during a pause or under heavy load.
+    """
+
+    def __init__(self, target_period_ns, window=50, kp=0.3, ki=0.05, max_fraction=0.5):
+        """Initialize the controller for a target period in nanoseconds"""
+        self.window = max(2, int(window))
+        self.kp = float(kp)
+        self.ki = float(ki)
+        self.max_fraction = max(0.0, float(max_fraction))
+        self.presses = deque(maxlen=self.window + 1)
+        self.reset()
+        self.set_target(target_period_ns)
+
+    @classmethod
+    def from_settings(cls, settings, target_period_ns):
+        """Return a controller for the settings, or None if disabled"""
+        if not settings.get("cps_controller_enabled", False):
+            return None
+        return cls(
+            target_period_ns,
+            window=settings.get("cps_controller_window", 50),
+            kp=settings.get("cps_controller_kp", 0.3),
+            ki=settings.get("cps_controller_ki", 0.05),
+            max_fraction=settings.get("cps_controller_max_fraction", 0.5)
+        )
+
+    def set_target(self, target_period_ns):
+        """Change the target period, keeping the learned integral"""
+        self.target_period_ns = max(1, int(target_period_ns))
+        self.max_correction_ns = self.max_fraction * self.target_period_ns
+
+    def reset(self):
+        """Forget the measured presses and the integral, e.g. after a pause"""
+        self.presses.clear()
+        self.integral_ns = 0.0
+        self.error_ns = 0.0
+        self.correction_ns = 0.0
+        self.saturated = False
+        self.updates = 0
+
+    def update(self, press_ns):
+        """Record a press and return the wait correction in nanoseconds"""
+        presses = self.presses
+        presses.append(press_ns)
+        if len(presses) < 2:
+            return self.correction_ns
+
+        measured = (presses[-1] - presses[0]) / (len(presses) - 1)
+        error = measured - self.target_period_ns
+        integral = self.integral_ns + error
+        output = -(self.kp * error + self.ki * integral)
+
+        limit = self.max_correction_ns
+        self.saturated = output > limit or output < -limit
+        if self.saturated:
+            output = max(-limit, min(limit, output))
+        else:
+            self.integral_ns = integral
+
+        self.error_ns = error
+        self.correction_ns = output
+        self.updates += 1
+        return output
+
+    def measured_cps(self):
+        presses = self.presses
+        if len(presses) < 2 or presses[-1] == presses[0]:
+            return 0.0
+        return (len(presses) - 1) * 1e9 / (presses[-1] - presses[0])
+
+    def state(self):
+        """Return the controller state for display"""
+        measured = self.measured_cps()
+        return {
+            "target_cps": 1e9 / self.target_period_ns,
+            "measured_cps": measured,
+            "error_cps": measured - 1e9 / self.target_period_ns if measured else 0.0,
+            "error_us": self.error_ns / 1000.0,
+            "correction_us": self.correction_ns / 1000.0,
+            "integral_us": self.integral_ns / 1000.0,
+            "saturated": self.saturated
+        }
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Cursor tracking for Aerout SpeedAutoClicker
+Samples the cursor position off the click path
+"""
+
+import math
+import time
+import threading
+
+
+class MovementDetector:
+    """Decides when clicking should pause because the user moved the mouse
+
+    Movement starts when the cursor drifts more than distance_threshold
+    pixels from where it was last still, or moves faster than
+    velocity_threshold px/s. Because of hysteresis it only counts as still
+    again once the speed drops below velocity_threshold * hysteresis. The
+    cursor then has to stay still for resume_delay_ms before clicking
+    resumes. Waiters block on a condition, so a paused click loop uses no CPU.
+    """
+
+    def __init__(self, distance_threshold=5.0, velocity_threshold=300.0, hysteresis=0.5, resume_delay_ms=150.0):
+        """Initialize the detector in the still state"""
+        self.condition = threading.Condition()
+        self.configure(distance_threshold, velocity_threshold, hysteresis, resume_delay_ms)
+        self.pause_count = 0
+        self.reset()
+
+    def configure(self, distance_threshold=None, velocity_threshold=None, hysteresis=None, resume_delay_ms=None):
+        """Change the detection thresholds"""
+        if distance_threshold is not None:
+            self.distance_threshold = float(distance_threshold)
+        if velocity_threshold is not None:
+            self.velocity_threshold = float(velocity_threshold)
+        if hysteresis is not None:
+            self.hysteresis = max(0.0, min(1.0, float(hysteresis)))
+        if resume_delay_ms is not None:
+            self.resume_delay_ns = int(max(0.0, float(resume_delay_ms)) * 1_000_000)
+
+    def reset(self):
+        """Forget the cursor history and return to the still state"""
+        with self.condition:
+            self.moving = False
+            self.anchor = None
+            self.previous = None
+            self.still_since_ns = None
+            self.resume_due_ns = None
+            self.condition.notify_all()
+
+    def update(self, position, timestamp_ns):
+        """Feed one cursor sample and return True while movement is detected"""
+        previous = self.previous
+        self.previous = (position, timestamp_ns)
+        if previous is None:
+            self.anchor = position
+            return self.moving
+
+        last_position, last_timestamp = previous
+        step = math.hypot(position.x - last_position.x, position.y - last_position.y)
+        elapsed = max(1, timestamp_ns - last_timestamp)
+        velocity = step * 1e9 / elapsed
+
+        if not self.moving:
+            drift = math.hypot(position.x - self.anchor.x, position.y - self.anchor.y)
+            if drift > self.distance_threshold or velocity > self.velocity_threshold:
+                with self.condition:
+                    self.moving = True
+                    self.still_since_ns = None
+                    self.pause_count += 1
+        elif velocity <= self.velocity_threshold * self.hysteresis:
+            if self.still_since_ns is None:
+                self.still_since_ns = timestamp_ns
+            if timestamp_ns - self.still_since_ns >= self.resume_delay_ns:
+                with self.condition:
+                    self.moving = False
+                    self.anchor = position
+                    self.resume_due_ns = self.still_since_ns + self.resume_delay_ns
+                    self.condition.notify_all()
+        else:
+            self.still_since_ns = None
+
+        return self.moving
+
+    def wait_until_still(self, stop_event, timeout=None):
+        """Block until movement has stopped or stop_event is set"""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.moving or stop_event.is_set(),
+                timeout=timeout
+            )
+
+    def wake(self):
+        """Wake every waiter so it can re-check its stop event"""
+        with self.condition:
+            self.condition.notify_all()
+
+
+class CursorSampler:
+    """Polls the cursor position on its own thread
+
+    The newest sample is published as a single ``(position, moved,
+    timestamp_ns)`` tuple in ``self.latest``. Replacing one attribute is
+    atomic, so readers never take a lock and never see a torn sample.
+    Every sample is also fed to the movement detector. Between runs the
+    thread parks instead of exiting, so starting again is only a wake-up.
+    """
+
+    def __init__(self, backend, rate_hz=250.0, detector=None):
+        """Initialize the sampler for the given backend"""
+        self.backend = backend
+        self.rate_hz = rate_hz
+        self.detector = detector if detector is not None else MovementDetector()
+        self.latest = None
+        self.sample_count = 0
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.active = threading.Event()
+        self.closed = False
+
+    def sample(self):
+        """Take one sample now and publish it"""
+        position = self.backend.get_mouse_position()
+        timestamp = time.perf_counter_ns()
+        moved = self.detector.update(position, timestamp)
+        self.latest = (position, moved, timestamp)
+        self.sample_count += 1
+        return self.latest
+
+    def _run(self):
+        while True:
+            self.active.wait()
+            if self.closed:
+                return
+            while not self.stop_event.wait(1.0 / max(1.0, self.rate_hz)):
+                try:
+                    self.sample()
+                except Exception as e:
+                    print(f"Error sampling cursor position: {e}")
+
+    def start(self):
+        """Take a first sample synchronously and start polling"""
+        if self.active.is_set():
+            return
+        self.latest = None
+        self.detector.reset()
+        self.sample()
+        self.stop_event.clear()
+        self.active.set()
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop polling; the thread parks until the next start"""
+        self.active.clear()
+        self.stop_event.set()
+
+    def close(self):
+        """Stop polling and end the thread"""
+        self.closed = True
+        self.stop()
+        self.active.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        self.thread = None
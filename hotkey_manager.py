@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""
+Hotkey handling for Aerout SpeedAutoClicker
+Global keyboard and mouse listeners dispatching precompiled chords to actions
+"""
+
+import sys
+import time
+import queue
+import string
+import threading
+from collections import deque
+
+from click_stats import LatencyHistogram
+
+CALLBACK_SAMPLES = 4096
+CALLBACK_SAMPLE_MASK = 63
+
+try:
+    from pynput import keyboard, mouse
+    from pynput.keyboard import Key, KeyCode
+except ImportError as e:
+    print(f"Error importing pynput: {e}")
+    keyboard = None
+    mouse = None
+    Key = None
+    KeyCode = None
+
+MODIFIER_NAMES = {
+    "shift_l": "shift", "shift_r": "shift",
+    "ctrl_l": "ctrl", "ctrl_r": "ctrl",
+    "alt_l": "alt", "alt_r": "alt",
+    "cmd_l": "cmd", "cmd_r": "cmd"
+}
+
+MOUSE_BUTTON_NAMES = ("mouse_middle", "mouse_x1", "mouse_x2")
+SCROLL_NAMES = ("scroll_up", "scroll_down")
+DARWIN_BUTTON_NAMES = {2: "mouse_middle", 3: "mouse_x1", 4: "mouse_x2"}
+PYNPUT_BUTTON_NAMES = {
+    "middle": "mouse_middle",
+    "x1": "mouse_x1", "x2": "mouse_x2",
+    "button8": "mouse_x1", "button9": "mouse_x2"
+}
+WM_MOUSEMOVE = 0x0200
+SCROLL_REPEAT_NS = 150_000_000
+
+
+def key_to_string(key):
+    """Return the settings name of a pynput key, or None if it cannot be a hotkey"""
+    try:
+        if isinstance(key, Key):
+            return MODIFIER_NAMES.get(key.name, key.name)
+        elif isinstance(key, KeyCode):
+            if key.char is not None:
+                return key.char.lower()
+            elif key.vk is not None:
+                if 48 <= key.vk <= 57:
+                    return chr(key.vk)
+                elif 65 <= key.vk <= 90:
+                    return chr(key.vk + 32)
+                elif key.vk >= 96 and key.vk <= 105:
+                    return str(key.vk - 96)
+        return None
+    except Exception as e:
+        print(f"Error converting key: {e}")
+        return None
+
+
+class KeyIndex:
+    """Assigns every key name a bit and maps pynput keys straight to those bits
+
+    Lookup tables for all Key members, printable characters and the
+    letter/digit virtual key codes are filled up front. Any other key goes
+    through key_to_string once and is cached, so a key event costs one
+    dict lookup.
+    """
+
+    def __init__(self):
+        """Build the lookup tables"""
+        self.bits = {}
+        self.names = []
+        self.special = {}
+        self.chars = {}
+        self.vks = {}
+        self.mouse_mask = self.mask(MOUSE_BUTTON_NAMES + SCROLL_NAMES)
+        self.scroll_mask = self.mask(SCROLL_NAMES)
+        self.modifier_mask = self.mask(sorted(set(MODIFIER_NAMES.values())))
+        if Key is None:
+            return
+
+        for member in Key:
+            self.special[member] = self.bit(key_to_string(member))
+        for char in string.ascii_letters + string.digits + string.punctuation + " ":
+            self.chars[char] = self.bit(char.lower())
+        for vk in list(range(48, 58)) + list(range(65, 91)) + list(range(96, 106)):
+            self.vks[vk] = self.bit(key_to_string(KeyCode.from_vk(vk)))
+
+    def bit(self, name):
+        """Return the bit of a key name, assigning a new one if needed"""
+        if name is None:
+            return 0
+        bit = self.bits.get(name)
+        if bit is None:
+            bit = 1 << len(self.names)
+            self.bits[name] = bit
+            self.names.append(name)
+        return bit
+
+    def mask(self, names):
+        """Return the combined bits of a list of key names"""
+        mask = 0
+        for name in names:
+            mask |= self.bit(name)
+        return mask
+
+    def key_names(self, mask):
+        """Return the key names whose bits are set in mask"""
+        return [name for index, name in enumerate(self.names) if mask >> index & 1]
+
+    def lookup(self, key):
+        """Return the bit of a pynput key, or 0 if it cannot be part of a hotkey"""
+        if key.__class__ is KeyCode:
+            char = key.char
+            bit = self.chars.get(char) if char is not None else self.vks.get(key.vk)
+        else:
+            bit = self.special.get(key)
+        if bit is None:
+            bit = self._learn(key)
+        return bit
+
+    def _learn(self, key):
+        bit = self.bit(key_to_string(key))
+        if isinstance(key, KeyCode):
+            if key.char is not None:
+                self.chars[key.char] = bit
+            elif key.vk is not None:
+                self.vks[key.vk] = bit
+        else:
+            try:
+                self.special[key] = bit
+            except TypeError:
+                pass
+        return bit
+
+
+def mouse_event_filter(msg, data):
+    """Windows hook filter that drops mouse moves before pynput converts them"""
+    return msg != WM_MOUSEMOVE
+
+
+def create_mouse_listener(manager):
+    """Return a mouse listener that only reports bindable buttons and scroll to manager
+
+    Moves are dropped as early as the platform allows: on macOS the event
+    tap is not even subscribed to move, drag or left/right button events, on
+    Windows the hook filter drops moves before pynput converts them, and
+    elsewhere they end in pynput's no-op move callback.
+    """
+    if sys.platform == "darwin":
+        import Quartz
+
+        move_events = {
+            Quartz.kCGEventMouseMoved, Quartz.kCGEventLeftMouseDragged,
+            Quartz.kCGEventRightMouseDragged, Quartz.kCGEventOtherMouseDragged
+        }
+
+        class FilteredMouseListener(mouse.Listener):
+            _EVENTS = (
+                Quartz.CGEventMaskBit(Quartz.kCGEventOtherMouseDown)
+                | Quartz.CGEventMaskBit(Quartz.kCGEventOtherMouseUp)
+                | Quartz.CGEventMaskBit(Quartz.kCGEventScrollWheel)
+            )
+
+            def _handle(self, proxy, event_type, event, refcon):
+                """pynput 1.7 hook, which does not flag injected events itself"""
+                injected = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGEventSourceUnixProcessID) != 0
+                self._handle_message(proxy, event_type, event, refcon, injected)
+
+            def _handle_message(self, _proxy, event_type, event, _refcon, injected):
+                if injected or event_type in move_events:
+                    return
+                if event_type == Quartz.kCGEventScrollWheel:
+                    manager.on_scroll_delta(Quartz.CGEventGetIntegerValueField(
+                        event, Quartz.kCGScrollWheelEventDeltaAxis1))
+                else:
+                    number = Quartz.CGEventGetIntegerValueField(event, Quartz.kCGMouseEventButtonNumber)
+                    manager.on_mouse_button(
+                        DARWIN_BUTTON_NAMES.get(number), event_type == Quartz.kCGEventOtherMouseDown)
+
+        return FilteredMouseListener()
+
+    return mouse.Listener(
+        on_click=manager.on_click,
+        on_scroll=manager.on_scroll,
+        win32_event_filter=mouse_event_filter
+    )
+
+
+class HotkeyBinding:
+    """One key chord compiled to a bitmask and bound to an action"""
+
+    __slots__ = ("keys", "mask", "action", "handler", "hold", "suppress", "options")
+
+    def __init__(self, keys, mask, action, handler, hold=False, suppress=False, options=None):
+        self.keys = keys
+        self.mask = mask
+        self.action = action
+        self.handler = handler
+        self.hold = hold
+        self.suppress = suppress
+        self.options = options or {}
+
+
+class HotkeyMatcher:
+    """Immutable compiled set of bindings that the listener callbacks read
+
+    Rebinding builds a new matcher and swaps it in with one attribute
+    assignment, so the running listener sees either the old or the new
+    bindings and never a mix. watch_mask holds the keys whose state the
+    listener has to track: the bound keys, or every key while capturing.
+    """
+
+    __slots__ = ("chords", "bound_mask", "watch_mask", "conflicts", "capture", "suppress")
+
+    def __init__(self, chords=None, conflicts=None, capture=False):
+        """Build a matcher from a dict of chord mask to HotkeyBinding"""
+        self.chords = chords or {}
+        self.conflicts = conflicts or []
+        self.capture = capture
+        bound_mask = 0
+        for mask in self.chords:
+            bound_mask |= mask
+        self.bound_mask = bound_mask
+        self.watch_mask = -1 if capture else bound_mask
+        self.suppress = any(binding.suppress for binding in self.chords.values())
+
+
+class EnhancedHotkeyManager:
+    """Keyboard listener that dispatches key chords to actions
+
+    The main "hotkey" setting drives callback in toggle or hold mode, and
+    every entry of the "hotkey_bindings" setting maps its own chord to one
+    of the handlers in actions. All chords live in one dict keyed by their
+    bitmask, so a key event costs the same however many bindings there are.
+
+    A chord fires when its last key goes down and the held keys that belong
+    to any binding are exactly that chord; keys no binding uses are ignored,
+    and a wider chord never triggers the narrower one it contains. When two
+    bindings share a chord, the main hotkey wins, then the earlier binding.
+    Auto-repeated presses of a key that is already down are dropped. The
+    left and right keys of a modifier share its bit, which stays set until
+    both sides are up. Only keys in the matcher's watch_mask are tracked;
+    the keyboard and mouse listeners update them under one lock. Starting
+    a listener forgets them, and a rebind drops the keys it no longer
+    watches, so a release that was never delivered cannot leave a key
+    stuck down.
+
+    The listener callbacks only match chords and queue the actions; a
+    dispatch thread runs them, so a slow action such as stopping the clicker
+    never holds up the OS keyboard listener. One callback in
+    CALLBACK_SAMPLE_MASK + 1 is timed, keeping the last CALLBACK_SAMPLES
+    times, and the queue-to-action latency of every action is kept for
+    get_metrics().
+
+    Bindings, capture mode and suppression all live in the current
+    HotkeyMatcher, so changing them swaps the matcher on the running
+    listener instead of restarting it. A suppressed binding swallows the key
+    press that completes its chord, its auto-repeats and its release; this
+    needs the macOS event tap, elsewhere the keys still reach other apps.
+    The tap is only installed while some binding suppresses, so turning
+    suppression on or off is the one change that restarts the listener.
+
+    Chords may include the middle and side mouse buttons ("mouse_middle",
+    "mouse_x1", "mouse_x2") and scroll ticks ("scroll_up", "scroll_down"),
+    which share the key bitmask. A mouse listener is started the first time
+    a binding needs one. Scroll ticks cannot be held, so a chord containing
+    one always fires as a press, and a tick within SCROLL_REPEAT_NS of the
+    last one in the same direction counts as a repeat.
+    """
+
+    def __init__(self, callback, settings, save_callback=None, listen=True, actions=None):
+        self.callback = callback
+        self.settings = settings
+        self.save_callback = save_callback
+        self.actions = dict(actions or {})
+        self.key_index = KeyIndex()
+        self.lock = threading.RLock()
+        self.pressed = 0
+        self.modifier_keys = {}
+        self.matcher = HotkeyMatcher()
+        self.held = []
+        self.suppressed = 0
+        self.suppress_event = False
+        self.listener = None
+        self.listener_intercepts = False
+        self.mouse_listener = None
+        self.last_scroll_ns = {}
+        self.capture_callback = None
+        self.callback_times = deque(maxlen=CALLBACK_SAMPLES)
+        self.events = 0
+        self.dispatch_latency = LatencyHistogram()
+        self.repeats = 0
+        self.rebinds = 0
+        self.rebind_ns = 0
+        self.queue = queue.SimpleQueue()
+        self.dispatch_thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self.dispatch_thread.start()
+        self.update_settings()
+        if listen:
+            self.start_listener()
+
+    def _main_action(self, state, binding):
+        self.callback(state)
+
+    def _compile(self, keys, action, handler, hold, suppress, options, chords, conflicts):
+        mask = self.key_index.mask(keys)
+        if not mask:
+            return
+        if mask in chords:
+            conflicts.append({"keys": list(keys), "action": action, "bound_to": chords[mask].action})
+            print(f"Error binding {' + '.join(keys)} to {action}: already bound to {chords[mask].action}")
+            return
+        if mask & self.key_index.scroll_mask:
+            hold = False
+        chords[mask] = HotkeyBinding(list(keys), mask, action, handler, hold, suppress, options)
+
+    def update_settings(self, settings=None):
+        """Recompile the hotkey and every binding and swap them into the live listener"""
+        start_ns = time.perf_counter_ns()
+        if settings is not None:
+            self.settings = settings
+        chords = {}
+        conflicts = []
+        suppress = self.settings.get("hotkey_suppress", False)
+
+        hotkey = self.settings["hotkey"]
+        mode = self.settings["mode"]
+        if hotkey.get("type") in ("keyboard", "mouse") and mode in ("toggle", "hold"):
+            self._compile(hotkey.get("keys", []), "clicker", self._main_action, mode == "hold",
+                          suppress, None, chords, conflicts)
+
+        for options in self.settings.get("hotkey_bindings", []):
+            action = options.get("action")
+            handler = self.actions.get(action)
+            if handler is None:
+                print(f"Error binding {' + '.join(options.get('keys', []))}: unknown action {action}")
+                continue
+            hold = options.get("mode", "press") == "hold"
+            self._compile(options.get("keys", []), action, handler, hold,
+                          options.get("suppress", suppress), options, chords, conflicts)
+
+        matcher = HotkeyMatcher(chords, conflicts)
+        with self.lock:
+            self.matcher = matcher
+            self.pressed &= matcher.watch_mask
+            self.modifier_keys = {bit: keys for bit, keys in self.modifier_keys.items() if bit & self.pressed}
+        self.rebinds += 1
+        self.rebind_ns = time.perf_counter_ns() - start_ns
+        if self.listener is not None and self.matcher.suppress != self.listener_intercepts:
+            self.start_listener()
+        else:
+            self._ensure_mouse_listener()
+
+    @property
+    def conflicts(self):
+        return self.matcher.conflicts
+
+    @property
+    def capturing(self):
+        return self.matcher.capture
+
+    def get_bindings(self):
+        """Return the compiled bindings in priority order"""
+        return list(self.matcher.chords.values())
+
+    def dispatch(self, binding, state):
+        """Queue a binding's action; state is True/False for hold bindings and None otherwise"""
+        self.queue.put((binding.handler, (state, binding), time.perf_counter_ns()))
+
+    def _dispatch_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            handler, args, queued_ns = item
+            self.dispatch_latency.record(time.perf_counter_ns() - queued_ns)
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"Error running hotkey action {getattr(handler, '__name__', handler)}: {e}")
+
+    def flush(self, timeout=1.0):
+        """Wait until every queued action has run; returns False on timeout"""
+        done = threading.Event()
+        self.queue.put((done.set, (), time.perf_counter_ns()))
+        return done.wait(timeout)
+
+    def get_metrics(self):
+        """Return listener callback time and queue-to-action latency in microseconds"""
+        callback_times = sorted(self.callback_times)
+        latency = self.dispatch_latency
+
+        def callback_percentile(percent):
+            if not callback_times:
+                return 0.0
+            return callback_times[min(len(callback_times) - 1, len(callback_times) * percent // 100)] / 1000.0
+
+        return {
+            "repeats_dropped": self.repeats,
+            "callback_p50_us": callback_percentile(50),
+            "callback_p99_us": callback_percentile(99),
+            "callback_max_us": callback_times[-1] / 1000.0 if callback_times else 0.0,
+            "actions": latency.count,
+            "dispatch_p50_us": latency.percentile(50) / 1000.0,
+            "dispatch_p99_us": latency.percentile(99) / 1000.0,
+            "dispatch_max_us": (latency.max or 0) / 1000.0,
+            "rebinds": self.rebinds,
+            "rebind_us": self.rebind_ns / 1000.0
+        }
+
+    def reset_metrics(self):
+        self.callback_times.clear()
+        self.dispatch_latency.reset()
+        self.repeats = 0
+
+    def start_listener(self):
+        self.reset_keys()
+        try:
+            if self.listener and self.listener.is_alive():
+                self.listener.stop()
+
+            intercepts = self.matcher.suppress
+            options = {"darwin_intercept": self._intercept} if intercepts else {}
+            self.listener = keyboard.Listener(
+                on_press=self.on_press,
+                on_release=self.on_release,
+                suppress=False,
+                **options
+            )
+            self.listener_intercepts = intercepts
+            self.listener.daemon = True
+            self.listener.start()
+        except Exception as e:
+            print(f"Error starting keyboard listener: {e}")
+        self._ensure_mouse_listener()
+
+    def _ensure_mouse_listener(self):
+        """Start the mouse listener once a binding or capture needs mouse buttons"""
+        matcher = self.matcher
+        if self.mouse_listener is not None or self.listener is None:
+            return
+        if not (matcher.capture or matcher.bound_mask & self.key_index.mouse_mask):
+            return
+        try:
+            self.mouse_listener = create_mouse_listener(self)
+            self.mouse_listener.daemon = True
+            self.mouse_listener.start()
+        except Exception as e:
+            self.mouse_listener = None
+            print(f"Error starting mouse listener: {e}")
+
+    def stop_listener(self):
+        if self.listener:
+            try:
+                self.listener.stop()
+                self.listener = None
+            except Exception as e:
+                print(f"Error stopping keyboard listener: {e}")
+        if self.mouse_listener:
+            try:
+                self.mouse_listener.stop()
+                self.mouse_listener = None
+            except Exception as e:
+                print(f"Error stopping mouse listener: {e}")
+
+    def restart_listener(self):
+        """Rebind on the running listener, starting a new one only if it is not alive"""
+        if self.listener and self.listener.is_alive():
+            self.update_settings()
+        else:
+            self.start_listener()
+
+    def _intercept(self, event_type, event):
+        """Swallow the key event the listener callback just marked as suppressed"""
+        if self.suppress_event:
+            self.suppress_event = False
+            return None
+        return event
+
+    def shutdown(self):
+        """Stop the listeners and the dispatch thread once the queued actions ran"""
+        self.stop_listener()
+        self.queue.put(None)
+        self.dispatch_thread.join(timeout=2.0)
+
+    def on_press(self, key):
+        self.suppress_event = False
+        self.events += 1
+        start_ns = 0 if self.events & CALLBACK_SAMPLE_MASK else time.perf_counter_ns()
+        try:
+            bit = self.key_index.lookup(key)
+            if bit & self.matcher.watch_mask:
+                with self.lock:
+                    if not bit & self.key_index.modifier_mask or self._modifier_side(key, bit, True):
+                        self._press(bit)
+        except Exception as e:
+            print(f"Error in on_press: {e}")
+        if start_ns:
+            self.callback_times.append(time.perf_counter_ns() - start_ns)
+        return True
+
+    def on_release(self, key):
+        self.suppress_event = False
+        self.events += 1
+        start_ns = 0 if self.events & CALLBACK_SAMPLE_MASK else time.perf_counter_ns()
+        try:
+            bit = self.key_index.lookup(key)
+            if bit & self.matcher.watch_mask:
+                with self.lock:
+                    if not bit & self.key_index.modifier_mask or self._modifier_side(key, bit, False):
+                        self._release(bit)
+        except Exception as e:
+            print(f"Error in on_release: {e}")
+        if start_ns:
+            self.callback_times.append(time.perf_counter_ns() - start_ns)
+        return True
+
+    def on_click(self, x, y, button, pressed, injected=False):
+        """pynput mouse click callback; synthetic clicks, including our own, are ignored"""
+        if not injected:
+            self.on_mouse_button(PYNPUT_BUTTON_NAMES.get(button.name), pressed)
+
+    def on_scroll(self, x, y, dx, dy, injected=False):
+        if not injected:
+            self.on_scroll_delta(dy)
+
+    def on_mouse_button(self, name, pressed):
+        """Handle a press or release of a bindable mouse button; other buttons pass None"""
+        if name is None:
+            return
+        self.events += 1
+        start_ns = 0 if self.events & CALLBACK_SAMPLE_MASK else time.perf_counter_ns()
+        try:
+            bit = self.key_index.bits[name]
+            if bit & self.matcher.watch_mask:
+                with self.lock:
+                    if pressed:
+                        self._press(bit)
+                    else:
+                        self._release(bit)
+        except Exception as e:
+            print(f"Error in on_mouse_button: {e}")
+        if start_ns:
+            self.callback_times.append(time.perf_counter_ns() - start_ns)
+
+    def on_scroll_delta(self, dy):
+        """Handle a scroll tick; a tick soon after one in the same direction is a repeat"""
+        if not dy:
+            return
+        start_ns = time.perf_counter_ns()
+        try:
+            bit = self.key_index.bits[SCROLL_NAMES[0] if dy > 0 else SCROLL_NAMES[1]]
+            last_ns = self.last_scroll_ns.get(bit, 0)
+            self.last_scroll_ns[bit] = start_ns
+            if start_ns - last_ns < SCROLL_REPEAT_NS:
+                self.repeats += 1
+            elif bit & self.matcher.watch_mask:
+                with self.lock:
+                    self._press(bit)
+                    self._release(bit)
+        except Exception as e:
+            print(f"Error in on_scroll_delta: {e}")
+        self.events += 1
+        if not self.events & CALLBACK_SAMPLE_MASK:
+            self.callback_times.append(time.perf_counter_ns() - start_ns)
+
+    def _modifier_side(self, key, bit, pressed):
+        """Track the held sides of a modifier; False while the other side keeps it down"""
+        held = self.modifier_keys.setdefault(bit, set())
+        if pressed:
+            other_side = any(side is not key for side in held)
+            held.add(key)
+            return not other_side
+        held.discard(key)
+        return not held
+
+    def _press(self, bit):
+        if self.pressed & bit:
+            self.repeats += 1
+            self.suppress_event = bool(self.suppressed & bit)
+            return
+        pressed = self.pressed | bit
+        self.pressed = pressed
+        matcher = self.matcher
+        if matcher.capture:
+            return
+
+        binding = matcher.chords.get(pressed & matcher.bound_mask)
+        if binding is not None and binding.mask & bit:
+            if binding.suppress:
+                self.suppressed |= bit
+                self.suppress_event = True
+            if binding.hold:
+                if binding not in self.held:
+                    self.held.append(binding)
+                    self.dispatch(binding, True)
+            else:
+                self.dispatch(binding, None)
+
+    def _release(self, bit):
+        if self.suppressed & bit:
+            self.suppressed &= ~bit
+            self.suppress_event = True
+        if self.matcher.capture and self.pressed & bit:
+            names = self.key_index.key_names(self.pressed)
+            new_hotkey = {
+                "type": "mouse" if self.pressed & self.key_index.mouse_mask else "keyboard",
+                "keys": names
+            }
+            self.settings["hotkey"] = new_hotkey
+            self.update_settings()
+            now_ns = time.perf_counter_ns()
+            if self.save_callback:
+                self.queue.put((self.save_callback, (self.settings,), now_ns))
+            if self.capture_callback:
+                self.queue.put((self.capture_callback, (new_hotkey,), now_ns))
+
+            self.pressed = 0
+            self.modifier_keys = {}
+            return
+
+        self.pressed &= ~bit
+        if self.held:
+            for binding in [binding for binding in self.held if binding.mask & bit]:
+                self.held.remove(binding)
+                self.dispatch(binding, False)
+
+    def reset_keys(self):
+        """Forget every held key; held bindings get their release"""
+        with self.lock:
+            held = self.held
+            self.pressed = 0
+            self.modifier_keys = {}
+            self.suppressed = 0
+            self.held = []
+            for binding in held:
+                self.dispatch(binding, False)
+
+    def start_capture(self, callback):
+        matcher = self.matcher
+        self.capture_callback = callback
+        self.reset_keys()
+        self.matcher = HotkeyMatcher(matcher.chords, matcher.conflicts, capture=True)
+        self._ensure_mouse_listener()
@@ -80,8 +80,8 @@ class ClickLogger:
         key_str = "+".join(keys)
         self.logger.info(f"Hotkey {event_type}: {key_str}")
     
-    def create_diagnostic_report(self):
-        """Create a diagnostic report"""
+    def create_diagnostic_report(self, timing_stats=None):
+        """Create a diagnostic report, including click timing statistics if given"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             report_dir = os.path.join(DIAG_DIR, f"report_{timestamp}")
@@ -105,6 +105,10 @@ class ClickLogger:
             with open(os.path.join(report_dir, "system_info.json"), "w") as f:
                 json.dump(system_info, f, indent=4)
 
+            if timing_stats is not None:
+                with open(os.path.join(report_dir, "click_timing.json"), "w") as f:
+                    json.dump(timing_stats, f, indent=4)
+
             zip_file = os.path.join(DIAG_DIR, f"aerout_diagnostic_{timestamp}.zip")
             shutil.make_archive(zip_file.replace(".zip", ""), 'zip', report_dir)
 
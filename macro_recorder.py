@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Macro recording for Aerout SpeedAutoClicker
+Records mouse and keyboard input to a compact binary file and plays it back
+"""
+
+import os
+import mmap
+import time
+import struct
+import threading
+from array import array
+
+from click_backends import BUTTON_TYPES, MouseEventCache, Point
+
+MACRO_MAGIC = b"AERM"
+MACRO_VERSION = 1
+HEADER = struct.Struct("<4sHHq")
+RECORD = struct.Struct("<qBxHff")
+
+MACRO_MOVE = 0
+MACRO_DOWN = 1
+MACRO_UP = 2
+MACRO_SCROLL = 3
+MACRO_KEY_DOWN = 4
+MACRO_KEY_UP = 5
+
+FLUSH_EVENTS = 4096
+CHUNK_RECORDS = 4096
+
+
+class MacroBuffer:
+    """Column arrays holding recorded events until they are flushed
+
+    Each event is a relative perf_counter_ns timestamp, a kind, a code (mouse
+    button index or virtual key code) and two floats: the position, or the
+    deltas for scroll events.
+    """
+
+    def __init__(self):
+        """Initialize empty columns"""
+        self.clear()
+
+    def clear(self):
+        """Drop every buffered event"""
+        self.times = array('q')
+        self.kinds = array('B')
+        self.codes = array('H')
+        self.xs = array('f')
+        self.ys = array('f')
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, timestamp_ns, kind, code, x, y):
+        """Buffer one event"""
+        self.times.append(timestamp_ns)
+        self.kinds.append(kind)
+        self.codes.append(code)
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def pack(self):
+        """Return the buffered events as packed records"""
+        pack = RECORD.pack
+        return b"".join(
+            pack(self.times[i], self.kinds[i], self.codes[i], self.xs[i], self.ys[i])
+            for i in range(len(self.times))
+        )
+
+
+class MacroRecorder:
+    """Records global mouse and keyboard input with pynput listeners
+
+    Events are timestamped with perf_counter_ns relative to start() and
+    flushed to the file every FLUSH_EVENTS events, so long recordings never
+    pile up in memory.
+    """
+
+    def __init__(self, file_path, record_moves=True):
+        """Initialize a recorder that writes to file_path"""
+        self.file_path = file_path
+        self.record_moves = record_moves
+        self.buffer = MacroBuffer()
+        self.lock = threading.Lock()
+        self.file = None
+        self.start_ns = 0
+        self.event_count = 0
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        self.button_codes = {}
+
+    def start(self):
+        """Open the file and start the listeners"""
+        from pynput import keyboard, mouse
+
+        self.button_codes = {
+            mouse.Button.left: BUTTON_TYPES.index("left"),
+            mouse.Button.right: BUTTON_TYPES.index("right"),
+            mouse.Button.middle: BUTTON_TYPES.index("middle")
+        }
+        self.file = open(self.file_path, 'wb')
+        self.file.write(HEADER.pack(MACRO_MAGIC, MACRO_VERSION, RECORD.size, time.time_ns()))
+        self.buffer.clear()
+        self.event_count = 0
+        self.start_ns = time.perf_counter_ns()
+
+        self.mouse_listener = mouse.Listener(
+            on_move=self.on_move if self.record_moves else None,
+            on_click=self.on_click,
+            on_scroll=self.on_scroll
+        )
+        self.keyboard_listener = keyboard.Listener(
+            on_press=self.on_press,
+            on_release=self.on_release
+        )
+        self.mouse_listener.daemon = True
+        self.keyboard_listener.daemon = True
+        self.mouse_listener.start()
+        self.keyboard_listener.start()
+
+    def stop(self):
+        """Stop the listeners, flush and close the file; returns the event count"""
+        for listener in (self.mouse_listener, self.keyboard_listener):
+            if listener:
+                try:
+                    listener.stop()
+                except Exception as e:
+                    print(f"Error stopping macro listener: {e}")
+        self.mouse_listener = None
+        self.keyboard_listener = None
+        with self.lock:
+            self._flush()
+            if self.file:
+                self.file.close()
+                self.file = None
+        return self.event_count
+
+    def _flush(self):
+        if self.file and len(self.buffer):
+            self.file.write(self.buffer.pack())
+            self.file.flush()
+            self.buffer.clear()
+
+    def record(self, kind, code, x, y):
+        """Buffer one event stamped with the time since start()"""
+        timestamp = time.perf_counter_ns() - self.start_ns
+        with self.lock:
+            self.buffer.append(timestamp, kind, code, x, y)
+            self.event_count += 1
+            if len(self.buffer) >= FLUSH_EVENTS:
+                self._flush()
+
+    def _key_code(self, key):
+        vk = getattr(key, "vk", None)
+        if vk is None:
+            value = getattr(key, "value", None)
+            vk = getattr(value, "vk", None)
+        return vk
+
+    def on_move(self, x, y):
+        self.record(MACRO_MOVE, 0, x, y)
+
+    def on_click(self, x, y, button, pressed):
+        code = self.button_codes.get(button)
+        if code is not None:
+            self.record(MACRO_DOWN if pressed else MACRO_UP, code, x, y)
+
+    def on_scroll(self, x, y, dx, dy):
+        self.record(MACRO_SCROLL, 0, dx, dy)
+
+    def on_press(self, key):
+        vk = self._key_code(key)
+        if vk is not None:
+            self.record(MACRO_KEY_DOWN, vk, 0.0, 0.0)
+
+    def on_release(self, key):
+        vk = self._key_code(key)
+        if vk is not None:
+            self.record(MACRO_KEY_UP, vk, 0.0, 0.0)
+
+
+def iter_macro_chunks(file_path, use_mmap=True, chunk_records=CHUNK_RECORDS):
+    """Yield lists of (time_ns, kind, code, x, y) records, one chunk at a time"""
+    chunk_bytes = RECORD.size * chunk_records
+    with open(file_path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError("Macro file is too short")
+        magic, version, record_size, _ = HEADER.unpack(header)
+        if magic != MACRO_MAGIC or record_size != RECORD.size:
+            raise ValueError(f"Not a macro file (version {version})")
+
+        size = os.fstat(f.fileno()).st_size
+        end = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+        if end == HEADER.size:
+            return
+
+        if use_mmap:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(HEADER.size, end, chunk_bytes):
+                    yield list(RECORD.iter_unpack(mapped[offset:min(end, offset + chunk_bytes)]))
+        else:
+            offset = HEADER.size
+            while offset < end:
+                data = f.read(min(chunk_bytes, end - offset))
+                offset += len(data)
+                yield list(RECORD.iter_unpack(data))
+
+
+class MacroPlayer:
+    """Streams a macro file back through an event backend
+
+    Each event is due at t0 plus its recorded offset. Mouse buttons and moves
+    reuse cached events, and only one chunk of the file is decoded at a time.
+    """
+
+    def __init__(self, backend, timer):
+        """Initialize the player for a backend and PrecisionTimer"""
+        self.backend = backend
+        self.timer = timer
+        self.caches = {button: MouseEventCache(backend) for button in BUTTON_TYPES}
+        self.move_event = None
+        self.key_events = {}
+        self.pressed = {}
+        self.pressed_ns = {}
+        self.timing_stats = None
+        self.event_count = 0
+        self.click_count = 0
+
+    def release_all(self):
+        """Release every mouse button and key the macro is holding"""
+        for event in list(self.pressed.values()):
+            self.backend.post(event)
+        self.pressed = {}
+        self.pressed_ns = {}
+
+    def _key_event(self, code, down):
+        event = self.key_events.get((code, down))
+        if event is None:
+            event = self.backend.create_key(code, down)
+            self.key_events[(code, down)] = event
+        return event
+
+    def _post(self, kind, code, x, y, due_ns):
+        backend = self.backend
+        if kind == MACRO_MOVE:
+            if self.move_event is None:
+                self.move_event = backend.create_mouse_move((x, y))
+            else:
+                backend.set_location(self.move_event, (x, y))
+            backend.post(self.move_event)
+        elif kind == MACRO_DOWN or kind == MACRO_UP:
+            button = BUTTON_TYPES[code] if code < len(BUTTON_TYPES) else "left"
+            mouse_down, mouse_up = self.caches[button].get(Point(x, y), button)
+            if kind == MACRO_DOWN:
+                backend.post(mouse_down)
+                self.pressed[("button", button)] = mouse_up
+                if self.timing_stats is not None:
+                    now = time.perf_counter_ns()
+                    self.pressed_ns[button] = now
+                    self.timing_stats.record_press(due_ns, now)
+            else:
+                backend.post(mouse_up)
+                self.pressed.pop(("button", button), None)
+                if self.timing_stats is not None and button in self.pressed_ns:
+                    self.timing_stats.record_release(self.pressed_ns.pop(button), time.perf_counter_ns())
+                self.click_count += 1
+        elif kind == MACRO_SCROLL:
+            backend.post(backend.create_scroll(x, y))
+        elif kind == MACRO_KEY_DOWN:
+            backend.post(self._key_event(code, True))
+            self.pressed[("key", code)] = self._key_event(code, False)
+        elif kind == MACRO_KEY_UP:
+            backend.post(self._key_event(code, False))
+            self.pressed.pop(("key", code), None)
+
+    def play(self, file_path, stop_event, precise=False, use_mmap=True, on_click=None):
+        """Play a macro file on the calling thread and return the number of events posted"""
+        self.event_count = 0
+        self.click_count = 0
+        sleep_until = self.timer.sleep_until
+        t0 = time.perf_counter_ns()
+        try:
+            for chunk in iter_macro_chunks(file_path, use_mmap=use_mmap):
+                for timestamp, kind, code, x, y in chunk:
+                    due_ns = t0 + timestamp
+                    sleep_until(due_ns, precise=precise)
+                    if stop_event.is_set():
+                        return self.event_count
+                    clicks = self.click_count
+                    self._post(kind, code, x, y, due_ns)
+                    self.event_count += 1
+                    if on_click and self.click_count != clicks:
+                        on_click(self)
+        finally:
+            self.release_all()
+        return self.event_count
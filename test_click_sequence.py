@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Click sequence tests for Aerout SpeedAutoClicker
+Plays compiled sequences on the recording backend
+"""
+
+import threading
+
+from click_backends import RecordingEventBackend
+from click_sequence import SequencePlayer, compile_sequence
+from click_timing import PrecisionTimer
+
+
+def test_zero_press_steps_keep_down_before_up():
+    steps = [
+        {"button": "left", "x": 10, "y": 10, "press_ms": 0, "gap_ms": 0},
+        {"button": "right", "x": 20, "y": 20, "press_ms": 0, "gap_ms": 0}
+    ]
+    backend = RecordingEventBackend()
+    player = SequencePlayer(backend, PrecisionTimer())
+
+    clicks = player.play(compile_sequence(steps), threading.Event())
+
+    assert [(event[1], event[2]) for event in backend.events] == [
+        ("down", "left"), ("up", "left"), ("down", "right"), ("up", "right")
+    ]
+    assert clicks == 2
+    assert player.pressed == {}
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Click engine tests for Aerout SpeedAutoClicker
+Runs the engine against the recording backend, no real clicks are posted
+"""
+
+import threading
+import time
+
+from click_backends import RecordingEventBackend
+from clicker_engine import AdvancedClickerEngine
+
+
+def test_start_stop_does_not_leak_jitter_threads():
+    settings = {
+        "interval_ms": 5,
+        "auto_calibrate": False,
+        "schedule_mode": "deadline",
+        "humanize_enabled": True
+    }
+    engine = AdvancedClickerEngine(settings, backend=RecordingEventBackend())
+    try:
+        engine.start_clicking()
+        time.sleep(0.02)
+        engine.stop_clicking()
+        threads = threading.active_count()
+
+        for _ in range(20):
+            engine.start_clicking()
+            time.sleep(0.02)
+            engine.stop_clicking()
+        time.sleep(0.1)
+
+        assert threading.active_count() <= threads
+    finally:
+        engine.shutdown()
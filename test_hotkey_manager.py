@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Hotkey manager tests for Aerout SpeedAutoClicker
+Feeds key events straight into the listener callbacks, no listener is started
+"""
+
+from hotkey_manager import EnhancedHotkeyManager
+
+
+class FakeKey:
+    """Stands in for a pynput key; the tests map it to a bit themselves"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+def make_manager(keys):
+    fired = []
+    settings = {"hotkey": {"type": "keyboard", "keys": keys}, "mode": "toggle"}
+    manager = EnhancedHotkeyManager(fired.append, settings, listen=False)
+    return manager, fired
+
+
+def bind(manager, key, name):
+    manager.key_index.special[key] = manager.key_index.bit(name)
+    return key
+
+
+def test_modifier_stays_down_while_other_side_is_held():
+    manager, fired = make_manager(["shift", "q"])
+    try:
+        shift_l = bind(manager, FakeKey("shift_l"), "shift")
+        shift_r = bind(manager, FakeKey("shift_r"), "shift")
+        q = bind(manager, FakeKey("q"), "q")
+
+        manager.on_press(shift_l)
+        manager.on_press(shift_r)
+        manager.on_release(shift_l)
+        manager.on_press(q)
+        manager.on_release(q)
+        manager.on_release(shift_r)
+        manager.on_press(q)
+        manager.flush()
+
+        assert fired == [None]
+        assert manager.pressed == manager.key_index.bit("q")
+    finally:
+        manager.shutdown()
+
+
+def test_reset_keys_forgets_a_key_whose_release_was_missed():
+    manager, fired = make_manager(["q"])
+    try:
+        q = bind(manager, FakeKey("q"), "q")
+
+        manager.on_press(q)
+        manager.reset_keys()
+        manager.on_press(q)
+        manager.flush()
+
+        assert fired == [None, None]
+    finally:
+        manager.shutdown()
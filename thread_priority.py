@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Thread priority for Aerout SpeedAutoClicker
+Raises the scheduling priority of the calling thread and pins it to cores
+"""
+
+import os
+import sys
+import ctypes
+import threading
+
+DEFAULT_REALTIME_PRIORITY = 10
+FALLBACK_NICE = -10
+QOS_CLASS_USER_INTERACTIVE = 0x21
+
+
+def _logger():
+    """Return the app logger; importing it sets up the log files on first use"""
+    from logger import app_logger
+    return app_logger
+
+
+def _parse_cpus(cpus):
+    if not cpus:
+        return None
+    if isinstance(cpus, str):
+        cpus = [part for part in cpus.replace(" ", "").split(",") if part]
+    return {int(cpu) for cpu in cpus}
+
+
+def _linux_priority(priority):
+    policy = os.SCHED_FIFO
+    priority = max(os.sched_get_priority_min(policy), min(os.sched_get_priority_max(policy), int(priority)))
+    try:
+        os.sched_setscheduler(0, policy, os.sched_param(priority))
+        return
+    except OSError as e:
+        _logger().warning(f"Real-time scheduling not permitted ({e}), trying nice {FALLBACK_NICE}")
+
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), FALLBACK_NICE)
+    except OSError as e:
+        _logger().warning(f"Raising thread niceness not permitted ({e})")
+
+
+def _macos_priority():
+    libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib")
+    result = libsystem.pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0)
+    if result != 0:
+        _logger().warning(f"Setting thread QoS class failed (error {result})")
+        return "default"
+    return "QoS user-interactive"
+
+
+def _macos_qos_class():
+    libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib")
+    libsystem.pthread_self.restype = ctypes.c_void_p
+    qos_class = ctypes.c_uint()
+    relative_priority = ctypes.c_int()
+    libsystem.pthread_get_qos_class_np(
+        ctypes.c_void_p(libsystem.pthread_self()), ctypes.byref(qos_class), ctypes.byref(relative_priority))
+    return qos_class.value, relative_priority.value
+
+
+def save_thread_priority():
+    """Return the calling thread's scheduling state for restore_thread_priority"""
+    state = {}
+    try:
+        if sys.platform.startswith("linux"):
+            state["policy"] = os.sched_getscheduler(0)
+            state["priority"] = os.sched_getparam(0).sched_priority
+            state["nice"] = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+        elif sys.platform == "darwin":
+            state["qos"] = _macos_qos_class()
+        if hasattr(os, "sched_getaffinity"):
+            state["cpus"] = os.sched_getaffinity(0)
+    except Exception as e:
+        _logger().warning(f"Could not read click thread priority: {e}")
+    return state
+
+
+def restore_thread_priority(state):
+    """Put the calling thread back to a state from save_thread_priority
+
+    Lowering a thread's priority is always permitted, so this undoes
+    whatever apply_thread_priority managed to raise.
+    """
+    try:
+        if "policy" in state:
+            os.sched_setscheduler(0, state["policy"], os.sched_param(state["priority"]))
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), state["nice"])
+        elif "qos" in state:
+            libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib")
+            libsystem.pthread_set_qos_class_self_np(*state["qos"])
+        if "cpus" in state:
+            os.sched_setaffinity(0, state["cpus"])
+    except Exception as e:
+        _logger().warning(f"Could not restore click thread priority: {e}")
+
+
+def describe_thread_policy():
+    """Return the scheduling policy the calling thread is running with"""
+    if hasattr(os, "sched_getscheduler"):
+        try:
+            policy = os.sched_getscheduler(0)
+            names = {
+                os.SCHED_OTHER: "SCHED_OTHER",
+                os.SCHED_FIFO: "SCHED_FIFO",
+                os.SCHED_RR: "SCHED_RR"
+            }
+            name = names.get(policy, f"policy {policy}")
+            if policy in (os.SCHED_FIFO, os.SCHED_RR):
+                return f"{name} priority {os.sched_getparam(0).sched_priority}"
+            return f"{name} nice {os.getpriority(os.PRIO_PROCESS, threading.get_native_id())}"
+        except OSError:
+            pass
+    return "default"
+
+
+def apply_thread_priority(priority=DEFAULT_REALTIME_PRIORITY, cpus=None):
+    """Raise the calling thread's priority and pin it to cpus where the platform allows
+
+    On Linux this is SCHED_FIFO, falling back to a lower nice value; on
+    macOS the thread gets the user-interactive QoS class. Returns a dict with
+    the effective "policy" and "cpus". Anything the process is not
+    permitted to do is logged and left at its default.
+    """
+    policy = "default"
+    try:
+        if sys.platform.startswith("linux"):
+            _linux_priority(priority)
+            policy = describe_thread_policy()
+        elif sys.platform == "darwin":
+            policy = _macos_priority()
+    except Exception as e:
+        _logger().warning(f"Could not raise click thread priority: {e}")
+
+    effective_cpus = None
+    try:
+        cpu_set = _parse_cpus(cpus)
+        if cpu_set and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpu_set)
+        if hasattr(os, "sched_getaffinity"):
+            effective_cpus = sorted(os.sched_getaffinity(0))
+        elif cpu_set:
+            _logger().warning("CPU pinning is not supported on this platform")
+    except (ValueError, OSError) as e:
+        _logger().warning(f"Could not pin click thread to cores {cpus}: {e}")
+
+    result = {"policy": policy, "cpus": effective_cpus}
+    _logger().info(f"Click thread priority: {policy}, cores: {effective_cpus if effective_cpus else 'any'}")
+    return result